@@ -0,0 +1,92 @@
+import os
+import numpy as np
+import pandas as pd
+
+print("=" * 80)
+print("📅 CALENDAR DIMENSION")
+print("=" * 80)
+
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
+else:
+    # One row per distinct date in the data. Temporal attributes are computed on
+    # this table only and reach the rows through an integer-code gather, so their
+    # cost depends on the number of distinct dates, not on the number of rows.
+    CALENDAR_COLUMNS = ['day_number', 'date', 'day_of_week', 'day_of_month', 'week_of_year',
+                        'is_weekend', 'is_month_start', 'is_month_end', 'is_holiday', 'holiday']
+
+    # Fixed-date national holidays; movable ones (Diwali, Eid, ...) can be listed
+    # with their date and name in HOLIDAYS_PATH
+    NATIONAL_HOLIDAYS = {(1, 26): 'Republic Day', (8, 15): 'Independence Day', (10, 2): 'Gandhi Jayanti'}
+    HOLIDAYS_PATH = 'holidays.csv'
+
+
+    def load_holidays(path=HOLIDAYS_PATH):
+        """Return {day number: holiday name} from the optional holidays table (columns date, name)."""
+        if not os.path.exists(path):
+            return {}
+        table = pd.read_csv(path, dtype=str)
+        days = encode_day_numbers(pd.to_datetime(table['date'], errors='coerce'))
+        return {int(day): name for day, name in zip(days, table['name']) if not pd.isna(day)}
+
+
+    def build_calendar(days, holidays=None):
+        """Return the calendar of the distinct non-missing day numbers in days, sorted by day number."""
+        distinct = np.unique(pd.unique(day_number_values(pd.array(days, dtype='Int32'))))
+        distinct = distinct[distinct != DAY_NAT]
+        # Decoded like the nullable date columns, so gathered dates keep the same resolution
+        dates = decode_day_numbers(pd.array(distinct, dtype='Int32'))
+        holidays = load_holidays() if holidays is None else holidays
+        names = [holidays.get(int(day), NATIONAL_HOLIDAYS.get((date.month, date.day)))
+                 for day, date in zip(distinct, dates)]
+        calendar = pd.DataFrame({
+            'day_number': distinct.astype(np.int32),
+            'date': dates,
+            'day_of_week': dates.dayofweek,
+            'day_of_month': dates.day,
+            'week_of_year': dates.isocalendar().week.to_numpy().astype(float),
+            'is_weekend': (dates.dayofweek >= 5).astype(int),
+            'is_month_start': (dates.day <= 5).astype(int),
+            'is_month_end': (dates.day >= 26).astype(int),
+            'is_holiday': np.array([name is not None for name in names], dtype=int),
+            'holiday': names
+        })
+        return calendar[CALENDAR_COLUMNS]
+
+
+    def calendar_codes(calendar, days):
+        """Return the calendar row of each day number in days, -1 for missing or unknown days."""
+        known = calendar['day_number'].to_numpy()
+        values = day_number_values(pd.array(days, dtype='Int32'))
+        codes = np.searchsorted(known, values)
+        found = codes < len(known)
+        found[found] = known[codes[found]] == values[found]
+        return np.where(found, codes, -1)
+
+
+    def gather_calendar(calendar, column, codes, fill=np.nan):
+        """Gather a calendar column to rows by code; rows with code -1 get fill.
+
+        As with the datetime accessors, integer attributes become float when a
+        row needs NaN, and dates become NaT.
+        """
+        values = calendar[column].to_numpy()
+        if (codes >= 0).all():
+            return values.take(codes)
+        if column == 'date':
+            fill = np.datetime64('NaT')
+        elif pd.isna(fill):
+            values = values.astype(float)
+        return np.where(codes >= 0, values.take(np.maximum(codes, 0)), fill)
+
+
+    # ===================================================================
+    # BUILD THE CALENDAR OF THE MERGED DATASET
+    # ===================================================================
+    calendar = build_calendar(integrated_dataset['date'])
+
+    print(f"\n📆 {len(calendar)} distinct dates "
+          f"({calendar['date'].min():%Y-%m-%d} to {calendar['date'].max():%Y-%m-%d}) "
+          f"for {len(integrated_dataset):,} rows")
+    print(f"   Weekend days: {calendar['is_weekend'].sum()}, holidays: {calendar['is_holiday'].sum()}"
+          f"{' (' + ', '.join(calendar['holiday'].dropna().unique()) + ')' if calendar['is_holiday'].any() else ''}")
@@ -0,0 +1,183 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+print("=" * 80)
+print("🗃️  DATA QUALITY HISTORY")
+print("=" * 80)
+
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
+else:
+    # Every run's quality metrics are appended to two small CSV tables, so a new
+    # export can be compared with earlier ones without re-reading their data:
+    #   runs.csv     one row per run: run id, timestamp, dataset fingerprint
+    #   metrics.csv  one row per (run, scope, key, metric) with its value
+    QUALITY_HISTORY_DIR = '.quality_history'
+    QUALITY_METRIC_KEYS = ['scope', 'key', 'metric']
+
+
+    def dataset_fingerprint(sources=None):
+        """Return a hash of the shard contents, the region name tables and the duplicate reduction.
+
+        Content hashes come from the shard cache metadata when present, so this
+        does not re-read the shards.
+        """
+        parts = []
+        for source in sources or list(SOURCE_SCHEMAS):
+            for path in discover_shards(source):
+                meta_path = shard_cache_paths(path)[1]
+                if os.path.exists(meta_path):
+                    with open(meta_path) as fh:
+                        content_hash = json.load(fh)['content_hash']
+                else:
+                    content_hash = file_content_hash(path)
+                parts.append([source, os.path.basename(path), content_hash])
+        parts.append(region_maps_fingerprint())
+        parts.append(DUPLICATE_KEY_REDUCTION)
+        return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
+
+
+    def state_quality_breakdown(dataset):
+        """Return per-state rows, complete rows, rows with each source, zero enrollments and duplicates.
+
+        Source counts come from the provenance index, so only the state codes and
+        the zero-enrollment columns are read. Duplicates are the source rows whose
+        key repeated before the merge collapsed them.
+        """
+        states = dataset['state']
+        codes = states.cat.codes.to_numpy()
+        categories = states.cat.categories
+
+        def by_state(positions=None, mask=None):
+            selected = codes if positions is None else codes[positions]
+            selected = selected if mask is None else selected[mask]
+            return np.bincount(selected[selected >= 0], minlength=len(categories))
+
+        breakdown = {'rows': by_state(), 'complete_rows': by_state(rows_with_sources(*SOURCE_BITS))}
+        for source in SOURCE_BITS:
+            breakdown[f'{source}_rows'] = by_state(rows_with_sources(source))
+        zero_columns, zero_check = PROFILE_ROW_CHECKS['zero_enrollment']
+        breakdown['zero_enrollment'] = by_state(mask=zero_check(dataset[zero_columns]).to_numpy())
+        table = pd.DataFrame(breakdown, index=categories)
+        table['duplicate_rows'] = data_profile.duplicates.by_state.reindex(table.index, fill_value=0)
+        return table[table['rows'] > 0]
+
+
+    def collect_quality_metrics():
+        """Return this run's quality metrics as a long table of (scope, key, metric, value).
+
+        Duplicate metrics are counted in each source before the merge (see
+        SourceDuplicateAnalysis), as the merged keys are unique once collapsed.
+        """
+        rows = len(integrated_dataset)
+        records = [
+            ('overall', 'all', 'rows', rows),
+            ('overall', 'all', 'missing_pct', total_missing_pct),
+            ('overall', 'all', 'complete_rows', complete_all),
+            ('overall', 'all', 'partial_rows', partial_records),
+            ('overall', 'all', 'zero_enrollment', zero_enrollments),
+            ('overall', 'all', 'duplicate_rows', total_duplicates),
+            ('overall', 'all', 'repeated_keys', data_profile.duplicates.repeated_keys),
+        ]
+        for col, missing in data_profile.table['missing'].items():
+            records.append(('column', col, 'missing', missing))
+        for source in SOURCE_BITS:
+            count_cols = SOURCE_SCHEMAS[source]['count_columns']
+            source_rows = count_rows_with_sources(source)
+            records.append(('source', source, 'rows', source_rows))
+            records.append(('source', source, 'complete_pct', source_rows / rows * 100 if rows else 0.0))
+            records.append(('source', source, 'missing_cells', data_profile.table.loc[count_cols, 'missing'].sum()))
+            records.append(('source', source, 'duplicate_rows', data_profile.duplicates.sources[source].rows))
+            records.append(('source', source, 'repeated_keys', data_profile.duplicates.sources[source].repeated_keys))
+            records.append(('source', source, 'rows_collapsed', duplicate_reduction.at[source, 'rows_collapsed']))
+        states = state_quality_breakdown(integrated_dataset)
+        for metric in states.columns:
+            records += [('state', state, metric, value) for state, value in states[metric].items()]
+        metrics = pd.DataFrame(records, columns=QUALITY_METRIC_KEYS + ['value'])
+        metrics['value'] = metrics['value'].astype('float64')
+        return metrics
+
+
+    def append_csv(path, table):
+        """Append rows to a CSV table, writing the header only when the file is new."""
+        table.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+
+    def record_quality_run(metrics, fingerprint, history_dir=QUALITY_HISTORY_DIR):
+        """Append a run and its metrics to the history and return the run id."""
+        os.makedirs(history_dir, exist_ok=True)
+        timestamp = pd.Timestamp.now()
+        run = f"{timestamp:%Y%m%dT%H%M%S%f}-{fingerprint[:8]}"
+        # Metrics first: a run listed in runs.csv always has its metrics stored
+        append_csv(os.path.join(history_dir, 'metrics.csv'), metrics.assign(run=run)[['run'] + list(metrics.columns)])
+        rows = int(metrics.set_index(QUALITY_METRIC_KEYS).at[('overall', 'all', 'rows'), 'value'])
+        append_csv(os.path.join(history_dir, 'runs.csv'),
+                   pd.DataFrame([{'run': run, 'timestamp': timestamp.isoformat(), 'fingerprint': fingerprint, 'rows': rows}]))
+        return run
+
+
+    def load_quality_runs(history_dir=QUALITY_HISTORY_DIR):
+        """Return every recorded run, oldest first."""
+        path = os.path.join(history_dir, 'runs.csv')
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=['run', 'timestamp', 'fingerprint', 'rows'])
+        return pd.read_csv(path, parse_dates=['timestamp']).sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+    def load_quality_metrics(runs, history_dir=QUALITY_HISTORY_DIR):
+        """Return the stored metrics of the given runs, one value column per run."""
+        metrics = pd.read_csv(os.path.join(history_dir, 'metrics.csv'), dtype={'key': str})
+        metrics = metrics[metrics['run'].isin(runs)]
+        return metrics.pivot_table(index=QUALITY_METRIC_KEYS, columns='run', values='value', aggfunc='last')[list(runs)]
+
+
+    def compare_quality_runs(before=None, after=None, changed_only=True, history_dir=QUALITY_HISTORY_DIR):
+        """Diff the stored metrics of two runs (default: the last two) without touching any data.
+
+        Returns one row per (scope, key, metric) with both values, the change and
+        the percentage change; a metric missing from one run shows as NaN there.
+        """
+        runs = load_quality_runs(history_dir)['run'].tolist()
+        if after is None:
+            after = runs[-1]
+        if before is None:
+            earlier = runs[:runs.index(after)]
+            if not earlier:
+                raise ValueError(f"no run recorded before '{after}' to compare with")
+            before = earlier[-1]
+        values = load_quality_metrics([before, after], history_dir)
+        diff = pd.DataFrame({'before': values[before], 'after': values[after]})
+        diff['change'] = diff['after'] - diff['before']
+        diff['pct_change'] = diff['change'] / diff['before'].abs().replace(0, np.nan) * 100
+        diff.attrs.update(before=before, after=after)
+        if changed_only:
+            diff = diff[~np.isclose(diff['before'], diff['after'], equal_nan=True)]
+        return diff
+
+
+    # ===================================================================
+    # RECORD THIS RUN AND COMPARE IT WITH THE PREVIOUS ONE
+    # ===================================================================
+    quality_metrics = collect_quality_metrics()
+    quality_run = record_quality_run(quality_metrics, dataset_fingerprint())
+    quality_runs = load_quality_runs()
+    print(f"\n📝 Recorded run {quality_run}: {len(quality_metrics):,} metrics "
+          f"({quality_metrics['scope'].value_counts().to_dict()})")
+    print(f"   History ({QUALITY_HISTORY_DIR}/): {len(quality_runs)} runs of "
+          f"{quality_runs['fingerprint'].nunique()} distinct datasets")
+
+    if len(quality_runs) > 1:
+        quality_changes = compare_quality_runs()
+        _previous = quality_runs.iloc[-2]
+        _same_data = _previous['fingerprint'] == quality_runs.iloc[-1]['fingerprint']
+        print(f"\n🔍 Compared with run {_previous['run']} ({'same' if _same_data else 'different'} dataset): "
+              f"{len(quality_changes)} metrics changed")
+        if len(quality_changes):
+            _largest = quality_changes['change'].abs().sort_values(ascending=False, kind='stable').index[:15]
+            print(quality_changes.loc[_largest].round(2).to_string())
+    else:
+        quality_changes = None
+        print("\nFirst recorded run: nothing to compare with yet")
@@ -15,206 +15,210 @@ zerve_colors = ['#A1C9F4', '#FFB482', '#8DE5A1', '#FF9F9B', '#D0BBFF',
 print("\n🎯 Target Variable Distribution")
 print("-" * 60)
 
-target_counts = pd.Series(y).value_counts().sort_index()
-print(f"\nTarget variable 'enrollment_complete':")
-print(f"  Class 0 (Incomplete): {target_counts[0]:,} ({target_counts[0]/len(y)*100:.2f}%)")
-print(f"  Class 1 (Complete):   {target_counts[1]:,} ({target_counts[1]/len(y)*100:.2f}%)")
-print(f"  Class imbalance ratio: {target_counts[0]/target_counts[1]:.2f}:1")
-
-# ===================================================================
-# 2. FEATURE VALUE DISTRIBUTIONS
-# ===================================================================
-print("\n📈 Key Feature Statistics")
-print("-" * 60)
-
-# Select important features to validate
-key_features = [
-    'total_enrollment', 'total_demographic', 'total_biometric',
-    'state_enrollment_rate', 'district_enrollment_rate',
-    'num_age_groups_covered', 'data_types_present',
-    'bio_completeness_score', 'has_zero_enrollments'
-]
-
-stats_summary = []
-for _feature in key_features:
-    _stats = {
-        'Feature': _feature,
-        'Mean': X[_feature].mean(),
-        'Std': X[_feature].std(),
-        'Min': X[_feature].min(),
-        'Max': X[_feature].max(),
-        'Q25': X[_feature].quantile(0.25),
-        'Median': X[_feature].quantile(0.50),
-        'Q75': X[_feature].quantile(0.75),
-        'Zero_pct': (X[_feature] == 0).mean() * 100
-    }
-    stats_summary.append(_stats)
-
-feature_stats_df = pd.DataFrame(stats_summary)
-
-print("\nKey feature statistics:")
-print(feature_stats_df.to_string(index=False))
-
-# ===================================================================
-# 3. TRAIN-TEST DISTRIBUTION COMPARISON
-# ===================================================================
-print("\n\n🔄 Train-Test Distribution Comparison")
-print("-" * 60)
-
-# Compare key features between train and test
-comparison_features = ['total_all_enrollments', 'state_enrollment_rate', 
-                       'bio_completeness_score', 'data_types_present']
-
-print("\nFeature distribution comparison (Train vs Test):")
-print(f"{'Feature':<30} {'Train Mean':>12} {'Test Mean':>12} {'Difference':>12}")
-print("-" * 70)
-
-for _feat in comparison_features:
-    _train_mean = X_train[_feat].mean()
-    _test_mean = X_test[_feat].mean()
-    _diff = abs(_train_mean - _test_mean)
-    print(f"{_feat:<30} {_train_mean:>12.2f} {_test_mean:>12.2f} {_diff:>12.2f}")
-
-# ===================================================================
-# 4. MISSING VALUES CHECK
-# ===================================================================
-print("\n\n❓ Missing Values Validation")
-print("-" * 60)
-
-missing_train = X_train.isnull().sum().sum()
-missing_test = X_test.isnull().sum().sum()
-
-print(f"Missing values in train set: {missing_train}")
-print(f"Missing values in test set:  {missing_test}")
-
-if missing_train == 0 and missing_test == 0:
-    print("✅ No missing values detected in train or test sets")
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
 else:
-    print("⚠️  Warning: Missing values detected!")
-
-# ===================================================================
-# 5. CLASS BALANCE VALIDATION
-# ===================================================================
-print("\n\n⚖️  Class Balance Validation")
-print("-" * 60)
-
-train_class_1_pct = y_train.mean() * 100
-test_class_1_pct = y_test.mean() * 100
-balance_diff = abs(train_class_1_pct - test_class_1_pct)
-
-print(f"Train set - Class 1 percentage: {train_class_1_pct:.2f}%")
-print(f"Test set  - Class 1 percentage: {test_class_1_pct:.2f}%")
-print(f"Difference: {balance_diff:.2f}%")
-
-if balance_diff < 1.0:
-    print("✅ Class balance is well-maintained between train and test")
-else:
-    print("⚠️  Class balance differs slightly between train and test")
-
-# ===================================================================
-# 6. VISUALIZATIONS
-# ===================================================================
-print("\n\n📊 Creating Distribution Visualizations...")
-print("-" * 60)
-
-validation_fig, axes = plt.subplots(2, 3, figsize=(16, 10))
-validation_fig.patch.set_facecolor('#1D1D20')
-
-# Set style for all axes
-for ax in axes.flat:
-    ax.set_facecolor('#1D1D20')
-    ax.tick_params(colors='#fbfbff', labelsize=9)
-    ax.spines['bottom'].set_color('#909094')
-    ax.spines['left'].set_color('#909094')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-
-# Plot 1: Target Distribution
-ax1 = axes[0, 0]
-classes = ['Incomplete', 'Complete']
-counts = [target_counts[0], target_counts[1]]
-bars = ax1.bar(classes, counts, color=[zerve_colors[0], zerve_colors[2]], edgecolor='#1D1D20', linewidth=2)
-ax1.set_title('Target Variable Distribution', fontsize=12, color='#fbfbff', pad=10, fontweight='bold')
-ax1.set_ylabel('Count', fontsize=10, color='#fbfbff')
-ax1.tick_params(axis='x', labelrotation=0)
-for bar in bars:
-    height = bar.get_height()
-    ax1.text(bar.get_x() + bar.get_width()/2., height,
-             f'{int(height):,}\n({height/len(y)*100:.1f}%)',
-             ha='center', va='bottom', fontsize=9, color='#fbfbff')
-
-# Plot 2: Data Types Present Distribution
-ax2 = axes[0, 1]
-data_types_dist = X['data_types_present'].value_counts().sort_index()
-ax2.bar(data_types_dist.index, data_types_dist.values, color=zerve_colors[1], 
-        edgecolor='#1D1D20', linewidth=2)
-ax2.set_title('Data Types Present per Record', fontsize=12, color='#fbfbff', pad=10, fontweight='bold')
-ax2.set_xlabel('Number of Data Types', fontsize=10, color='#fbfbff')
-ax2.set_ylabel('Count', fontsize=10, color='#fbfbff')
-ax2.set_xticks([0, 1, 2, 3])
-
-# Plot 3: Train-Test Split Comparison
-ax3 = axes[0, 2]
-split_data = ['Train', 'Test']
-split_counts = [len(X_train), len(X_test)]
-ax3.bar(split_data, split_counts, color=[zerve_colors[4], zerve_colors[5]], 
-        edgecolor='#1D1D20', linewidth=2)
-ax3.set_title('Train-Test Split', fontsize=12, color='#fbfbff', pad=10, fontweight='bold')
-ax3.set_ylabel('Number of Samples', fontsize=10, color='#fbfbff')
-for _i, (_label, _count) in enumerate(zip(split_data, split_counts)):
-    ax3.text(_i, _count, f'{_count:,}\n({_count/len(X)*100:.0f}%)',
-             ha='center', va='bottom', fontsize=9, color='#fbfbff')
-
-# Plot 4: Enrollment Totals Distribution (log scale)
-ax4 = axes[1, 0]
-enrollment_nonzero = X_train[X_train['total_all_enrollments'] > 0]['total_all_enrollments']
-ax4.hist(enrollment_nonzero, bins=50, color=zerve_colors[3], edgecolor='#1D1D20', alpha=0.8)
-ax4.set_title('Total Enrollments Distribution\n(excluding zeros)', fontsize=12, color='#fbfbff', 
-              pad=10, fontweight='bold')
-ax4.set_xlabel('Total Enrollments', fontsize=10, color='#fbfbff')
-ax4.set_ylabel('Frequency', fontsize=10, color='#fbfbff')
-ax4.set_yscale('log')
-
-# Plot 5: State Enrollment Rate Distribution
-ax5 = axes[1, 1]
-ax5.hist(X_train['state_enrollment_rate'], bins=30, color=zerve_colors[6], 
-         edgecolor='#1D1D20', alpha=0.8)
-ax5.set_title('State Enrollment Rate Distribution', fontsize=12, color='#fbfbff', 
-              pad=10, fontweight='bold')
-ax5.set_xlabel('Enrollment Rate', fontsize=10, color='#fbfbff')
-ax5.set_ylabel('Frequency', fontsize=10, color='#fbfbff')
-
-# Plot 6: Feature Correlation with Target
-ax6 = axes[1, 2]
-correlations = []
-correlation_features = ['has_enrollment', 'has_demographic', 'has_biometric',
-                        'data_types_present', 'state_enrollment_rate']
-for _feat in correlation_features:
-    _corr = np.corrcoef(X_train[_feat], y_train)[0, 1]
-    correlations.append(_corr)
-
-y_positions = np.arange(len(correlation_features))
-ax6.barh(y_positions, correlations, color=zerve_colors[0], edgecolor='#1D1D20', linewidth=2)
-ax6.set_title('Feature Correlation with Target', fontsize=12, color='#fbfbff', 
-              pad=10, fontweight='bold')
-ax6.set_yticks(y_positions)
-ax6.set_yticklabels([f.replace('_', ' ').title() for f in correlation_features], fontsize=8)
-ax6.set_xlabel('Correlation Coefficient', fontsize=10, color='#fbfbff')
-
-plt.tight_layout(pad=2.0)
-print("✅ Validation visualizations created")
-
-# ===================================================================
-# SUMMARY
-# ===================================================================
-print("\n" + "=" * 60)
-print("✅ VALIDATION COMPLETE")
-print("=" * 60)
-
-print(f"\n📋 Summary:")
-print(f"   ✓ Target variable properly defined (25.67% complete)")
-print(f"   ✓ All features have valid distributions")
-print(f"   ✓ No missing values in train/test sets")
-print(f"   ✓ Class balance maintained in stratified split")
-print(f"   ✓ Train and test sets have similar distributions")
-print(f"\n🎯 Dataset is ready for machine learning modeling!")
+    target_counts = pd.Series(y).value_counts().sort_index()
+    print(f"\nTarget variable 'enrollment_complete':")
+    print(f"  Class 0 (Incomplete): {target_counts[0]:,} ({target_counts[0]/len(y)*100:.2f}%)")
+    print(f"  Class 1 (Complete):   {target_counts[1]:,} ({target_counts[1]/len(y)*100:.2f}%)")
+    print(f"  Class imbalance ratio: {target_counts[0]/target_counts[1]:.2f}:1")
+
+    # ===================================================================
+    # 2. FEATURE VALUE DISTRIBUTIONS
+    # ===================================================================
+    print("\n📈 Key Feature Statistics")
+    print("-" * 60)
+
+    # Select important features to validate
+    key_features = [
+        'total_enrollment', 'total_demographic', 'total_biometric',
+        'state_enrollment_rate', 'district_enrollment_rate',
+        'num_age_groups_covered', 'data_types_present',
+        'bio_completeness_score', 'has_zero_enrollments'
+    ]
+
+    stats_summary = []
+    for _feature in key_features:
+        _stats = {
+            'Feature': _feature,
+            'Mean': X[_feature].mean(),
+            'Std': X[_feature].std(),
+            'Min': X[_feature].min(),
+            'Max': X[_feature].max(),
+            'Q25': X[_feature].quantile(0.25),
+            'Median': X[_feature].quantile(0.50),
+            'Q75': X[_feature].quantile(0.75),
+            'Zero_pct': (X[_feature] == 0).mean() * 100
+        }
+        stats_summary.append(_stats)
+
+    feature_stats_df = pd.DataFrame(stats_summary)
+
+    print("\nKey feature statistics:")
+    print(feature_stats_df.to_string(index=False))
+
+    # ===================================================================
+    # 3. TRAIN-TEST DISTRIBUTION COMPARISON
+    # ===================================================================
+    print("\n\n🔄 Train-Test Distribution Comparison")
+    print("-" * 60)
+
+    # Compare key features between train and test
+    comparison_features = ['total_all_enrollments', 'state_enrollment_rate', 
+                           'bio_completeness_score', 'data_types_present']
+
+    print("\nFeature distribution comparison (Train vs Test):")
+    print(f"{'Feature':<30} {'Train Mean':>12} {'Test Mean':>12} {'Difference':>12}")
+    print("-" * 70)
+
+    for _feat in comparison_features:
+        _train_mean = X_train[_feat].mean()
+        _test_mean = X_test[_feat].mean()
+        _diff = abs(_train_mean - _test_mean)
+        print(f"{_feat:<30} {_train_mean:>12.2f} {_test_mean:>12.2f} {_diff:>12.2f}")
+
+    # ===================================================================
+    # 4. MISSING VALUES CHECK
+    # ===================================================================
+    print("\n\n❓ Missing Values Validation")
+    print("-" * 60)
+
+    # Counted block by block on the views, without materializing the train and test rows
+    missing_train = X_train.missing_counts().sum()
+    missing_test = X_test.missing_counts().sum()
+
+    print(f"Missing values in train set: {missing_train}")
+    print(f"Missing values in test set:  {missing_test}")
+
+    if missing_train == 0 and missing_test == 0:
+        print("✅ No missing values detected in train or test sets")
+    else:
+        print("⚠️  Warning: Missing values detected!")
+
+    # ===================================================================
+    # 5. CLASS BALANCE VALIDATION
+    # ===================================================================
+    print("\n\n⚖️  Class Balance Validation")
+    print("-" * 60)
+
+    train_class_1_pct = y_train.mean() * 100
+    test_class_1_pct = y_test.mean() * 100
+    balance_diff = abs(train_class_1_pct - test_class_1_pct)
+
+    print(f"Train set - Class 1 percentage: {train_class_1_pct:.2f}%")
+    print(f"Test set  - Class 1 percentage: {test_class_1_pct:.2f}%")
+    print(f"Difference: {balance_diff:.2f}%")
+
+    if balance_diff < 1.0:
+        print("✅ Class balance is well-maintained between train and test")
+    else:
+        print("⚠️  Class balance differs slightly between train and test")
+
+    # ===================================================================
+    # 6. VISUALIZATIONS
+    # ===================================================================
+    print("\n\n📊 Creating Distribution Visualizations...")
+    print("-" * 60)
+
+    validation_fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    validation_fig.patch.set_facecolor('#1D1D20')
+
+    # Set style for all axes
+    for ax in axes.flat:
+        ax.set_facecolor('#1D1D20')
+        ax.tick_params(colors='#fbfbff', labelsize=9)
+        ax.spines['bottom'].set_color('#909094')
+        ax.spines['left'].set_color('#909094')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+
+    # Plot 1: Target Distribution
+    ax1 = axes[0, 0]
+    classes = ['Incomplete', 'Complete']
+    counts = [target_counts[0], target_counts[1]]
+    bars = ax1.bar(classes, counts, color=[zerve_colors[0], zerve_colors[2]], edgecolor='#1D1D20', linewidth=2)
+    ax1.set_title('Target Variable Distribution', fontsize=12, color='#fbfbff', pad=10, fontweight='bold')
+    ax1.set_ylabel('Count', fontsize=10, color='#fbfbff')
+    ax1.tick_params(axis='x', labelrotation=0)
+    for bar in bars:
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height,
+                 f'{int(height):,}\n({height/len(y)*100:.1f}%)',
+                 ha='center', va='bottom', fontsize=9, color='#fbfbff')
+
+    # Plot 2: Data Types Present Distribution
+    ax2 = axes[0, 1]
+    data_types_dist = X['data_types_present'].value_counts().sort_index()
+    ax2.bar(data_types_dist.index, data_types_dist.values, color=zerve_colors[1], 
+            edgecolor='#1D1D20', linewidth=2)
+    ax2.set_title('Data Types Present per Record', fontsize=12, color='#fbfbff', pad=10, fontweight='bold')
+    ax2.set_xlabel('Number of Data Types', fontsize=10, color='#fbfbff')
+    ax2.set_ylabel('Count', fontsize=10, color='#fbfbff')
+    ax2.set_xticks([0, 1, 2, 3])
+
+    # Plot 3: Train-Test Split Comparison
+    ax3 = axes[0, 2]
+    split_data = ['Train', 'Test']
+    split_counts = [len(X_train), len(X_test)]
+    ax3.bar(split_data, split_counts, color=[zerve_colors[4], zerve_colors[5]], 
+            edgecolor='#1D1D20', linewidth=2)
+    ax3.set_title('Train-Test Split', fontsize=12, color='#fbfbff', pad=10, fontweight='bold')
+    ax3.set_ylabel('Number of Samples', fontsize=10, color='#fbfbff')
+    for _i, (_label, _count) in enumerate(zip(split_data, split_counts)):
+        ax3.text(_i, _count, f'{_count:,}\n({_count/len(X)*100:.0f}%)',
+                 ha='center', va='bottom', fontsize=9, color='#fbfbff')
+
+    # Plot 4: Enrollment Totals Distribution (log scale)
+    ax4 = axes[1, 0]
+    enrollment_nonzero = X_train[X_train['total_all_enrollments'] > 0]['total_all_enrollments']
+    ax4.hist(enrollment_nonzero, bins=50, color=zerve_colors[3], edgecolor='#1D1D20', alpha=0.8)
+    ax4.set_title('Total Enrollments Distribution\n(excluding zeros)', fontsize=12, color='#fbfbff', 
+                  pad=10, fontweight='bold')
+    ax4.set_xlabel('Total Enrollments', fontsize=10, color='#fbfbff')
+    ax4.set_ylabel('Frequency', fontsize=10, color='#fbfbff')
+    ax4.set_yscale('log')
+
+    # Plot 5: State Enrollment Rate Distribution
+    ax5 = axes[1, 1]
+    ax5.hist(X_train['state_enrollment_rate'], bins=30, color=zerve_colors[6], 
+             edgecolor='#1D1D20', alpha=0.8)
+    ax5.set_title('State Enrollment Rate Distribution', fontsize=12, color='#fbfbff', 
+                  pad=10, fontweight='bold')
+    ax5.set_xlabel('Enrollment Rate', fontsize=10, color='#fbfbff')
+    ax5.set_ylabel('Frequency', fontsize=10, color='#fbfbff')
+
+    # Plot 6: Feature Correlation with Target
+    ax6 = axes[1, 2]
+    correlations = []
+    correlation_features = ['has_enrollment', 'has_demographic', 'has_biometric',
+                            'data_types_present', 'state_enrollment_rate']
+    for _feat in correlation_features:
+        _corr = np.corrcoef(X_train[_feat], y_train)[0, 1]
+        correlations.append(_corr)
+
+    y_positions = np.arange(len(correlation_features))
+    ax6.barh(y_positions, correlations, color=zerve_colors[0], edgecolor='#1D1D20', linewidth=2)
+    ax6.set_title('Feature Correlation with Target', fontsize=12, color='#fbfbff', 
+                  pad=10, fontweight='bold')
+    ax6.set_yticks(y_positions)
+    ax6.set_yticklabels([f.replace('_', ' ').title() for f in correlation_features], fontsize=8)
+    ax6.set_xlabel('Correlation Coefficient', fontsize=10, color='#fbfbff')
+
+    plt.tight_layout(pad=2.0)
+    print("✅ Validation visualizations created")
+
+    # ===================================================================
+    # SUMMARY
+    # ===================================================================
+    print("\n" + "=" * 60)
+    print("✅ VALIDATION COMPLETE")
+    print("=" * 60)
+
+    print(f"\n📋 Summary:")
+    print(f"   ✓ Target variable properly defined (25.67% complete)")
+    print(f"   ✓ All features have valid distributions")
+    print(f"   ✓ No missing values in train/test sets")
+    print(f"   ✓ Class balance maintained in stratified split")
+    print(f"   ✓ Train and test sets have similar distributions")
+    print(f"\n🎯 Dataset is ready for machine learning modeling!")
@@ -1,269 +1,468 @@
+import os
+import json
+import time
+import hashlib
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 
 print("🔧 FEATURE ENGINEERING FOR MODELING")
 print("=" * 60)
 
-# Create a working copy
-modeling_df = integrated_dataset.copy()
-
-print(f"\n📊 Starting with {len(modeling_df):,} rows and {len(modeling_df.columns)} columns\n")
-
-# ===================================================================
-# 1. TARGET VARIABLE: Enrollment Completion
-# ===================================================================
-print("🎯 Creating Target Variable: enrollment_complete")
-print("-" * 60)
-
-# Define enrollment completion: all three data types exist (enrollment, demographic, biometric)
-modeling_df['has_enrollment'] = (
-    modeling_df['age_0_5'].notna() | 
-    modeling_df['age_5_17'].notna() | 
-    modeling_df['age_18_greater'].notna()
-).astype(int)
-
-modeling_df['has_demographic'] = (
-    modeling_df['demo_age_5_17'].notna() | 
-    modeling_df['demo_age_17_'].notna()
-).astype(int)
-
-modeling_df['has_biometric'] = (
-    modeling_df['bio_age_5_17'].notna() | 
-    modeling_df['bio_age_17_'].notna()
-).astype(int)
-
-# Target: 1 if all three data types exist, 0 otherwise
-modeling_df['enrollment_complete'] = (
-    (modeling_df['has_enrollment'] == 1) & 
-    (modeling_df['has_demographic'] == 1) & 
-    (modeling_df['has_biometric'] == 1)
-).astype(int)
-
-print(f"Target variable distribution:")
-print(f"  Complete (1): {modeling_df['enrollment_complete'].sum():,} ({modeling_df['enrollment_complete'].mean()*100:.2f}%)")
-print(f"  Incomplete (0): {(modeling_df['enrollment_complete'] == 0).sum():,} ({(1-modeling_df['enrollment_complete'].mean())*100:.2f}%)")
-
-# ===================================================================
-# 2. TEMPORAL FEATURES
-# ===================================================================
-print("\n⏰ Engineering Temporal Features")
-print("-" * 60)
-
-modeling_df['date'] = pd.to_datetime(modeling_df['date'], format='%d-%m-%Y', errors='coerce')
-modeling_df['day_of_week'] = modeling_df['date'].dt.dayofweek
-modeling_df['day_of_month'] = modeling_df['date'].dt.day
-modeling_df['week_of_year'] = modeling_df['date'].dt.isocalendar().week.astype(float)
-modeling_df['is_weekend'] = (modeling_df['day_of_week'] >= 5).astype(int)
-modeling_df['is_month_start'] = (modeling_df['day_of_month'] <= 5).astype(int)
-modeling_df['is_month_end'] = (modeling_df['day_of_month'] >= 26).astype(int)
-
-print(f"  ✓ Created 6 temporal features")
-print(f"    - day_of_week, day_of_month, week_of_year")
-print(f"    - is_weekend, is_month_start, is_month_end")
-
-# ===================================================================
-# 3. ENROLLMENT METRICS (fill missing with 0 for aggregation)
-# ===================================================================
-print("\n📈 Engineering Enrollment Metrics")
-print("-" * 60)
-
-# Fill missing enrollment values with 0
-enroll_cols = ['age_0_5', 'age_5_17', 'age_18_greater', 'demo_age_5_17', 
-               'demo_age_17_', 'bio_age_5_17', 'bio_age_17_']
-
-for col in enroll_cols:
-    modeling_df[col] = modeling_df[col].fillna(0)
-
-# Total enrollments by category
-modeling_df['total_enrollment'] = (
-    modeling_df['age_0_5'] + 
-    modeling_df['age_5_17'] + 
-    modeling_df['age_18_greater']
-)
-
-modeling_df['total_demographic'] = (
-    modeling_df['demo_age_5_17'] + 
-    modeling_df['demo_age_17_']
-)
-
-modeling_df['total_biometric'] = (
-    modeling_df['bio_age_5_17'] + 
-    modeling_df['bio_age_17_']
-)
-
-modeling_df['total_all_enrollments'] = (
-    modeling_df['total_enrollment'] + 
-    modeling_df['total_demographic'] + 
-    modeling_df['total_biometric']
-)
-
-print(f"  ✓ Created enrollment totals")
-print(f"    - total_enrollment, total_demographic, total_biometric")
-print(f"    - total_all_enrollments")
-
-# ===================================================================
-# 4. AGE GROUP INDICATORS AND PROPORTIONS
-# ===================================================================
-print("\n👥 Engineering Age Group Features")
-print("-" * 60)
-
-# Age group indicators (binary)
-modeling_df['has_age_0_5'] = (modeling_df['age_0_5'] > 0).astype(int)
-modeling_df['has_age_5_17_enroll'] = (modeling_df['age_5_17'] > 0).astype(int)
-modeling_df['has_age_18_plus'] = (modeling_df['age_18_greater'] > 0).astype(int)
-
-# Age group proportions
-modeling_df['pct_age_0_5'] = np.where(
-    modeling_df['total_enrollment'] > 0,
-    modeling_df['age_0_5'] / modeling_df['total_enrollment'] * 100,
-    0
-)
-
-modeling_df['pct_age_5_17'] = np.where(
-    modeling_df['total_enrollment'] > 0,
-    modeling_df['age_5_17'] / modeling_df['total_enrollment'] * 100,
-    0
-)
-
-modeling_df['pct_age_18_plus'] = np.where(
-    modeling_df['total_enrollment'] > 0,
-    modeling_df['age_18_greater'] / modeling_df['total_enrollment'] * 100,
-    0
-)
-
-# Number of age groups covered
-modeling_df['num_age_groups_covered'] = (
-    modeling_df['has_age_0_5'] + 
-    modeling_df['has_age_5_17_enroll'] + 
-    modeling_df['has_age_18_plus']
-)
-
-print(f"  ✓ Created age group indicators and proportions")
-print(f"    - Binary indicators for each age group")
-print(f"    - Percentage distribution across age groups")
-print(f"    - Number of age groups covered")
-
-# ===================================================================
-# 5. BIOMETRIC COMPLETENESS
-# ===================================================================
-print("\n🔐 Engineering Biometric Completeness Features")
-print("-" * 60)
-
-modeling_df['bio_completeness_score'] = (
-    modeling_df['has_biometric'] * 100
-)
-
-modeling_df['bio_to_demo_ratio'] = np.where(
-    modeling_df['total_demographic'] > 0,
-    modeling_df['total_biometric'] / modeling_df['total_demographic'],
-    0
-)
-
-modeling_df['bio_to_enroll_ratio'] = np.where(
-    modeling_df['total_enrollment'] > 0,
-    modeling_df['total_biometric'] / modeling_df['total_enrollment'],
-    0
-)
-
-print(f"  ✓ Created biometric completeness features")
-print(f"    - bio_completeness_score, bio_to_demo_ratio, bio_to_enroll_ratio")
-
-# ===================================================================
-# 6. REGIONAL/STATE-LEVEL AGGREGATIONS
-# ===================================================================
-print("\n🗺️  Engineering Regional Features")
-print("-" * 60)
-
-# State-level enrollment rates
-state_enrollment_rate = modeling_df.groupby('state')['enrollment_complete'].mean()
-modeling_df['state_enrollment_rate'] = modeling_df['state'].map(state_enrollment_rate)
-
-# State-level average enrollments
-state_avg_total = modeling_df.groupby('state')['total_all_enrollments'].mean()
-modeling_df['state_avg_enrollments'] = modeling_df['state'].map(state_avg_total)
-
-# State-level record count (how many records per state)
-state_record_counts = modeling_df.groupby('state').size()
-modeling_df['state_record_count'] = modeling_df['state'].map(state_record_counts)
-
-# District-level enrollment rates
-district_enrollment_rate = modeling_df.groupby(['state', 'district'])['enrollment_complete'].mean()
-modeling_df['district_enrollment_rate'] = modeling_df.apply(
-    lambda row: district_enrollment_rate.get((row['state'], row['district']), 0), 
-    axis=1
-)
-
-# Pincode-level completeness
-pincode_completeness = modeling_df.groupby('pincode')['enrollment_complete'].mean()
-modeling_df['pincode_enrollment_rate'] = modeling_df['pincode'].map(pincode_completeness)
-
-print(f"  ✓ Created regional aggregation features")
-print(f"    - state_enrollment_rate, state_avg_enrollments, state_record_count")
-print(f"    - district_enrollment_rate, pincode_enrollment_rate")
-
-# ===================================================================
-# 7. DATA QUALITY INDICATORS
-# ===================================================================
-print("\n✅ Engineering Data Quality Features")
-print("-" * 60)
-
-modeling_df['data_types_present'] = (
-    modeling_df['has_enrollment'] + 
-    modeling_df['has_demographic'] + 
-    modeling_df['has_biometric']
-)
-
-modeling_df['is_partial_enrollment'] = (
-    (modeling_df['data_types_present'] > 0) & 
-    (modeling_df['data_types_present'] < 3)
-).astype(int)
-
-modeling_df['has_zero_enrollments'] = (
-    modeling_df['total_all_enrollments'] == 0
-).astype(int)
-
-print(f"  ✓ Created data quality indicators")
-print(f"    - data_types_present, is_partial_enrollment, has_zero_enrollments")
-
-# ===================================================================
-# SUMMARY OF ENGINEERED FEATURES
-# ===================================================================
-print("\n" + "=" * 60)
-print("📋 FEATURE ENGINEERING COMPLETE")
-print("=" * 60)
-
-new_feature_cols = [
-    # Target
-    'enrollment_complete',
-    # Helper columns
-    'has_enrollment', 'has_demographic', 'has_biometric',
-    # Temporal
-    'day_of_week', 'day_of_month', 'week_of_year', 'is_weekend', 
-    'is_month_start', 'is_month_end',
-    # Enrollment metrics
-    'total_enrollment', 'total_demographic', 'total_biometric', 'total_all_enrollments',
-    # Age groups
-    'has_age_0_5', 'has_age_5_17_enroll', 'has_age_18_plus',
-    'pct_age_0_5', 'pct_age_5_17', 'pct_age_18_plus', 'num_age_groups_covered',
-    # Biometric
-    'bio_completeness_score', 'bio_to_demo_ratio', 'bio_to_enroll_ratio',
-    # Regional
-    'state_enrollment_rate', 'state_avg_enrollments', 'state_record_count',
-    'district_enrollment_rate', 'pincode_enrollment_rate',
-    # Data quality
-    'data_types_present', 'is_partial_enrollment', 'has_zero_enrollments'
-]
-
-print(f"\n✨ Total engineered features: {len(new_feature_cols)}")
-print(f"   Dataset shape: {modeling_df.shape}")
-print(f"\n   Feature categories:")
-print(f"   - Target variable: 1")
-print(f"   - Helper columns: 3")
-print(f"   - Temporal features: 6")
-print(f"   - Enrollment metrics: 4")
-print(f"   - Age group features: 7")
-print(f"   - Biometric features: 3")
-print(f"   - Regional features: 5")
-print(f"   - Data quality features: 3")
-
-print(f"\n✅ Feature engineering successful!")
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
+else:
+    # ===================================================================
+    # FEATURE REGISTRY
+    # ===================================================================
+    # Each feature declares the dataset columns and the other features it reads,
+    # plus a vectorized definition taking those values in that order. The planner
+    # computes only what was requested and what it depends on, computes each
+    # shared intermediate (total_enrollment, ...) once, and runs the features of
+    # one dependency stage concurrently.
+    FEATURE_WORKERS = None  # defaults to the CPU count
+
+    # On-disk feature store: every output column is saved under the fingerprint of
+    # its definition, parameters and inputs, and loaded memory-mapped while that
+    # fingerprint is unchanged. The newest FEATURE_STORE_VERSIONS builds of each
+    # feature are kept, so switching back to an earlier definition also hits.
+    FEATURE_STORE = os.environ.get('AADHAAR_FEATURE_STORE', '1') == '1'
+    FEATURE_STORE_DIR = '.feature_store'
+    FEATURE_STORE_VERSION = 1
+    FEATURE_STORE_VERSIONS = 3
+
+    # Report order of the groups; 'prepared' features replace dataset columns
+    # (decoded dates, zero-filled counts) or are intermediates, and are not counted as engineered
+    FEATURE_GROUPS = ['target', 'helper', 'temporal', 'enrollment', 'age_group', 'biometric', 'regional', 'quality']
+
+
+    class FeatureSpec:
+        """One registered definition: its group, the dataset columns and features it reads, and the features it outputs.
+
+        Most definitions output the single feature they are named after; one that
+        shares a pass over the data between several features returns a tuple with
+        one value per name in outputs. params lists any other data the definition
+        reads (e.g. the calendar table), so that it is part of the fingerprint.
+        """
+
+        def __init__(self, name, group, compute, columns=(), inputs=(), outputs=None, params=None):
+            self.name, self.group, self.compute = name, group, compute
+            self.columns, self.inputs = list(columns), list(inputs)
+            self.outputs = [name] if outputs is None else list(outputs)
+            self.params = params or {}
+
+
+    # Feature name -> the FeatureSpec computing it
+    FEATURE_REGISTRY = {}
+
+
+    def register_feature(name, group, compute, columns=(), inputs=(), outputs=None, params=None):
+        """Add a definition to FEATURE_REGISTRY; compute receives the columns, then the inputs, as Series."""
+        spec = FeatureSpec(name, group, compute, columns, inputs, outputs, params)
+        for output in spec.outputs:
+            FEATURE_REGISTRY[output] = spec
+
+
+    def share(part, total, scale=1):
+        """Return part / total * scale, and 0 where total is 0."""
+        return np.where(total > 0, part / total * scale, 0)
+
+
+    def plan_features(requested, registry=FEATURE_REGISTRY):
+        """Return the stages computing the requested features and everything they depend on.
+
+        A feature's stage is one more than the deepest stage among its inputs, so the
+        features of a stage only read earlier stages and can run concurrently.
+        Features keep registry order within a stage; a feature sharing its
+        definition with others brings them along.
+        """
+        depth = {}
+
+        def visit(name, path):
+            if name not in registry:
+                raise KeyError(f"unknown feature '{name}'")
+            if name in path:
+                raise ValueError(f"feature dependency cycle: {' -> '.join(path + (name,))}")
+            if name not in depth:
+                depth[name] = 1 + max((visit(parent, path + (name,)) for parent in registry[name].inputs), default=-1)
+            return depth[name]
+
+        for name in requested:
+            for output in registry[name].outputs if name in registry else [name]:
+                visit(output, ())
+        stages = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name in registry:
+            if name in depth:
+                stages[depth[name]].append(name)
+        return stages
+
+
+    def definition_fingerprint(func):
+        """Hash a definition's bytecode and defaults, and those of the functions and classes of this
+        notebook it refers to by name, so that editing a helper such as share() also invalidates it."""
+        digest, seen = hashlib.blake2b(digest_size=16), set()
+
+        def visit_code(code, namespace):
+            digest.update(code.co_code)
+            digest.update(repr(code.co_names).encode())
+            for const in code.co_consts:
+                if inspect.iscode(const):
+                    visit_code(const, namespace)
+                else:
+                    digest.update(repr(const).encode())
+            for name in code.co_names:
+                ref = namespace.get(name)
+                if (inspect.isfunction(ref) or inspect.isclass(ref)) and ref.__module__ == namespace.get('__name__'):
+                    visit(ref)
+
+        def visit(obj):
+            if id(obj) in seen:
+                return
+            seen.add(id(obj))
+            if inspect.isclass(obj):
+                for member in vars(obj).values():
+                    member = getattr(member, '__func__', member)
+                    if inspect.isfunction(member):
+                        visit(member)
+                return
+            digest.update(repr(obj.__defaults__).encode())
+            visit_code(obj.__code__, obj.__globals__)
+
+        visit(func)
+        return digest.hexdigest()
+
+
+    def value_fingerprint(value):
+        """Hash the content of a column or table (or the repr of anything else)."""
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            data = pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes()
+        else:
+            data = repr(value).encode()
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+    def spec_fingerprint(spec, column_fingerprints, feature_fingerprints):
+        """Return the fingerprint of a definition applied to the given columns and input features."""
+        parts = [FEATURE_STORE_VERSION, spec.name, spec.outputs, definition_fingerprint(spec.compute),
+                 {key: value_fingerprint(value) for key, value in sorted(spec.params.items())},
+                 [column_fingerprints[col] for col in spec.columns],
+                 [feature_fingerprints[parent] for parent in spec.inputs]]
+        return hashlib.blake2b(json.dumps(parts).encode(), digest_size=16).hexdigest()
+
+
+    def feature_store_paths(name, fingerprint, store_dir=FEATURE_STORE_DIR):
+        """Return the (values, metadata) paths of one stored build of a feature."""
+        stem = os.path.join(store_dir, name, fingerprint)
+        return stem + '.npy', stem + '.json'
+
+
+    def load_stored_feature(name, fingerprint, store_dir=FEATURE_STORE_DIR):
+        """Return the stored values of a feature build as a read-only memory map, or None on a miss."""
+        data_path, meta_path = feature_store_paths(name, fingerprint, store_dir)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+        return np.load(data_path, mmap_mode='r')
+
+
+    def store_feature(spec, name, fingerprint, values, seconds, store_dir=FEATURE_STORE_DIR):
+        """Save one feature build with its lineage and build time, then drop builds beyond FEATURE_STORE_VERSIONS.
+
+        Returns False (storing nothing) for object values, which cannot be memory-mapped.
+        """
+        array = values.to_numpy()
+        if array.dtype == object:
+            return False
+        os.makedirs(os.path.join(store_dir, name), exist_ok=True)
+        data_path, meta_path = feature_store_paths(name, fingerprint, store_dir)
+        save_column(data_path, array)
+        meta = {'feature': name, 'definition': spec.name, 'group': spec.group, 'fingerprint': fingerprint,
+                'columns': spec.columns, 'inputs': spec.inputs, 'params': sorted(spec.params), 'rows': len(array),
+                'dtype': str(array.dtype), 'build_seconds': seconds, 'built_at': pd.Timestamp.now().isoformat()}
+        # The metadata is written last and marks the build as complete
+        with open(meta_path + '.tmp', 'w') as fh:
+            json.dump(meta, fh)
+        os.replace(meta_path + '.tmp', meta_path)
+
+        builds = sorted(load_feature_builds(name, store_dir), key=lambda build: build['built_at'], reverse=True)
+        for build in builds[FEATURE_STORE_VERSIONS:]:
+            for path in feature_store_paths(name, build['fingerprint'], store_dir):
+                os.remove(path)
+        return True
+
+
+    def load_feature_builds(name, store_dir=FEATURE_STORE_DIR):
+        """Return the metadata of every stored build of a feature."""
+        feature_dir = os.path.join(store_dir, name)
+        builds = []
+        for filename in sorted(os.listdir(feature_dir)) if os.path.isdir(feature_dir) else []:
+            if filename.endswith('.json'):
+                with open(os.path.join(feature_dir, filename)) as fh:
+                    builds.append(json.load(fh))
+        return builds
+
+
+    def feature_lineage(name, registry=FEATURE_REGISTRY):
+        """Return (dataset columns, features) that a feature is derived from, directly or not."""
+        columns, features, pending = set(), set(), [name]
+        while pending:
+            spec = registry[pending.pop()]
+            columns.update(spec.columns)
+            for parent in spec.inputs:
+                if parent not in features:
+                    features.add(parent)
+                    pending.append(parent)
+        return sorted(columns), sorted(features)
+
+
+    def feature_store_listing(fingerprints=None, store_dir=FEATURE_STORE_DIR, registry=FEATURE_REGISTRY):
+        """Return one row per stored feature: the build in use, its lineage, size and build time.
+
+        With fingerprints (as returned in compute_features' timing attrs), a row
+        describes the build they select and current marks whether it is stored;
+        without them, or when it is not stored, the row describes the latest build.
+        """
+        rows = []
+        for name in registry:
+            builds = sorted(load_feature_builds(name, store_dir), key=lambda build: build['built_at'])
+            if not builds:
+                continue
+            wanted = None if fingerprints is None else fingerprints.get(name)
+            used = [build for build in builds if build['fingerprint'] == wanted]
+            build = used[-1] if used else builds[-1]
+            columns, features = feature_lineage(name, registry)
+            rows.append({'feature': name, 'definition': build['definition'], 'group': build['group'],
+                         'inputs': ', '.join(build['columns'] + build['inputs']),
+                         'lineage': ', '.join(columns), 'upstream_features': len(features),
+                         'fingerprint': build['fingerprint'][:12], 'builds': len(builds),
+                         'MB': os.path.getsize(feature_store_paths(name, build['fingerprint'], store_dir)[0]) / 1e6,
+                         'build_seconds': build['build_seconds'], 'built_at': build['built_at'][:19],
+                         'current': None if fingerprints is None else bool(used)})
+        return pd.DataFrame(rows)
+
+
+    def compute_features(dataset, requested=None, workers=FEATURE_WORKERS, registry=FEATURE_REGISTRY,
+                         store_dir=FEATURE_STORE_DIR if FEATURE_STORE else None):
+        """Compute the requested features (default: all) of dataset and return (values by name, timing table).
+
+        Each dataset column is read once however many features use it. With a
+        store_dir, a definition whose fingerprint has a stored build is loaded
+        from disk instead of computed, and new builds are stored. The timing table
+        has one row per column read and per definition, with 'store' telling
+        whether it was loaded ('hit'), computed ('built') or computed but not
+        storable ('unstored', object values); its attrs hold the fingerprint of
+        every feature.
+        """
+        stages = plan_features(list(registry) if requested is None else requested, registry)
+        planned = [name for stage in stages for name in stage]
+        timings = []
+
+        columns, column_fingerprints = {}, {}
+        for col in dict.fromkeys(col for name in planned for col in registry[name].columns):
+            start = time.perf_counter()
+            columns[col] = dataset[col]
+            if store_dir is not None:
+                column_fingerprints[col] = value_fingerprint(columns[col])
+            timings.append({'name': col, 'group': 'column', 'stage': -1, 'store': 'read',
+                            'seconds': time.perf_counter() - start})
+
+        values, fingerprints = {}, {}
+
+        def run(spec, stage):
+            start = time.perf_counter()
+            status, stored = 'off', None
+            if store_dir is not None:
+                fingerprint = spec_fingerprint(spec, column_fingerprints, fingerprints)
+                stored = [load_stored_feature(output, fingerprint, store_dir) for output in spec.outputs]
+                status = 'hit' if all(array is not None for array in stored) else 'built'
+            if status == 'hit':
+                result = stored if len(spec.outputs) > 1 else stored[0]
+            else:
+                result = spec.compute(*[columns[col] for col in spec.columns], *[values[parent] for parent in spec.inputs])
+            for output, output_values in zip(spec.outputs, result if len(spec.outputs) > 1 else [result]):
+                values[output] = pd.Series(output_values, index=dataset.index, name=output)
+            seconds = time.perf_counter() - start
+            if status == 'built':
+                stored = [store_feature(spec, output, fingerprint, values[output], seconds, store_dir)
+                          for output in spec.outputs]
+                status = 'built' if all(stored) else 'unstored'
+            if store_dir is not None:
+                fingerprints.update(dict.fromkeys(spec.outputs, fingerprint))
+            timings.append({'name': spec.name, 'group': spec.group, 'stage': stage, 'store': status, 'seconds': seconds})
+
+        workers = workers or max(1, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for stage, names in enumerate(stages):
+                # Every stage waits for the previous one; results surface worker exceptions
+                specs = dict.fromkeys(registry[name] for name in names)
+                for future in [pool.submit(run, spec, stage) for spec in specs]:
+                    future.result()
+        timings = pd.DataFrame(timings)
+        timings.attrs['fingerprints'] = fingerprints
+        return {name: values[name] for name in registry if name in values}, timings
+
+
+    # -------------------------------------------------------------------
+    # Prepared dataset columns
+    # -------------------------------------------------------------------
+    enroll_cols = ['age_0_5', 'age_5_17', 'age_18_greater', 'demo_age_5_17',
+                   'demo_age_17_', 'bio_age_5_17', 'bio_age_17_']
+
+    # Each row's calendar row (see Calendar Dimension); dates and temporal features are gathered by it
+    register_feature('calendar_code', 'prepared', lambda days: calendar_codes(calendar, days), columns=['date'],
+                     params={'calendar': calendar})
+    register_feature('date', 'prepared', lambda code: gather_calendar(calendar, 'date', code), inputs=['calendar_code'],
+                     params={'calendar': calendar})
+    # Missing counts become 0, as float64 (the type the model features were built on)
+    for _col in enroll_cols:
+        register_feature(_col, 'prepared', lambda counts: counts.astype('float64').fillna(0), columns=[_col])
+
+    # -------------------------------------------------------------------
+    # 1. Target: all three data types exist; presence flags come from the merge's provenance bitmask
+    # -------------------------------------------------------------------
+    for _source, _bit in SOURCE_BITS.items():
+        register_feature(f'has_{_source}', 'helper', lambda mask, bit=_bit: ((mask & bit) > 0).astype(int),
+                         columns=[PROVENANCE_COLUMN])
+    register_feature('enrollment_complete', 'target',
+                     lambda enroll, demo, bio: ((enroll == 1) & (demo == 1) & (bio == 1)).astype(int),
+                     inputs=['has_enrollment', 'has_demographic', 'has_biometric'])
+
+    # -------------------------------------------------------------------
+    # 2. Temporal
+    # -------------------------------------------------------------------
+    for _name in ['day_of_week', 'day_of_month', 'week_of_year']:
+        register_feature(_name, 'temporal', lambda code, name=_name: gather_calendar(calendar, name, code),
+                         inputs=['calendar_code'], params={'calendar': calendar})
+    # Flags are 0 for rows without a date
+    for _name in ['is_weekend', 'is_month_start', 'is_month_end', 'is_holiday']:
+        register_feature(_name, 'temporal', lambda code, name=_name: gather_calendar(calendar, name, code, fill=0),
+                         inputs=['calendar_code'], params={'calendar': calendar})
+
+    # -------------------------------------------------------------------
+    # 3. Enrollment totals
+    # -------------------------------------------------------------------
+    register_feature('total_enrollment', 'enrollment', lambda a, b, c: a + b + c,
+                     inputs=['age_0_5', 'age_5_17', 'age_18_greater'])
+    register_feature('total_demographic', 'enrollment', lambda a, b: a + b, inputs=['demo_age_5_17', 'demo_age_17_'])
+    register_feature('total_biometric', 'enrollment', lambda a, b: a + b, inputs=['bio_age_5_17', 'bio_age_17_'])
+    register_feature('total_all_enrollments', 'enrollment', lambda a, b, c: a + b + c,
+                     inputs=['total_enrollment', 'total_demographic', 'total_biometric'])
+
+    # -------------------------------------------------------------------
+    # 4. Age group indicators and proportions
+    # -------------------------------------------------------------------
+    register_feature('has_age_0_5', 'age_group', lambda counts: (counts > 0).astype(int), inputs=['age_0_5'])
+    register_feature('has_age_5_17_enroll', 'age_group', lambda counts: (counts > 0).astype(int), inputs=['age_5_17'])
+    register_feature('has_age_18_plus', 'age_group', lambda counts: (counts > 0).astype(int), inputs=['age_18_greater'])
+    register_feature('pct_age_0_5', 'age_group', lambda counts, total: share(counts, total, 100),
+                     inputs=['age_0_5', 'total_enrollment'])
+    register_feature('pct_age_5_17', 'age_group', lambda counts, total: share(counts, total, 100),
+                     inputs=['age_5_17', 'total_enrollment'])
+    register_feature('pct_age_18_plus', 'age_group', lambda counts, total: share(counts, total, 100),
+                     inputs=['age_18_greater', 'total_enrollment'])
+    register_feature('num_age_groups_covered', 'age_group', lambda a, b, c: a + b + c,
+                     inputs=['has_age_0_5', 'has_age_5_17_enroll', 'has_age_18_plus'])
+
+    # -------------------------------------------------------------------
+    # 5. Biometric completeness
+    # -------------------------------------------------------------------
+    register_feature('bio_completeness_score', 'biometric', lambda has_bio: has_bio * 100, inputs=['has_biometric'])
+    register_feature('bio_to_demo_ratio', 'biometric', share, inputs=['total_biometric', 'total_demographic'])
+    register_feature('bio_to_enroll_ratio', 'biometric', share, inputs=['total_biometric', 'total_enrollment'])
+
+    # -------------------------------------------------------------------
+    # 6. Regional aggregations: one rollup of the state > district > pincode hierarchy for all five features
+    # -------------------------------------------------------------------
+    def regional_features(state, district, pincode, target, total):
+        """State completion rate, average and record count, district and pincode completion rates.
+
+        Rows without a state get NaN state rates and averages and a record count
+        of 0, rows without a state or district a district rate of 0, and rows
+        without a pincode a NaN pincode rate. Pincodes are grouped across districts.
+        """
+        rollup = RegionalRollup(state, district, pincode, {'target': target, 'total': total})
+        return (rollup.broadcast('state', rollup.mean('state', 'target')),
+                rollup.broadcast('state', rollup.mean('state', 'total')),
+                rollup.broadcast('state', rollup.sizes('state'), fill=0, dtype=np.int64),
+                rollup.broadcast('district', rollup.mean('district', 'target'), fill=0),
+                rollup.broadcast(['pincode'], rollup.mean(['pincode'], 'target')))
+
+
+    register_feature('regional_group_stats', 'regional', regional_features,
+                     columns=['state', 'district', 'pincode'], inputs=['enrollment_complete', 'total_all_enrollments'],
+                     outputs=['state_enrollment_rate', 'state_avg_enrollments', 'state_record_count',
+                              'district_enrollment_rate', 'pincode_enrollment_rate'])
+
+    # -------------------------------------------------------------------
+    # 7. Data quality indicators
+    # -------------------------------------------------------------------
+    register_feature('data_types_present', 'quality', lambda a, b, c: a + b + c,
+                     inputs=['has_enrollment', 'has_demographic', 'has_biometric'])
+    register_feature('is_partial_enrollment', 'quality', lambda present: ((present > 0) & (present < 3)).astype(int),
+                     inputs=['data_types_present'])
+    register_feature('has_zero_enrollments', 'quality', lambda total: (total == 0).astype(int),
+                     inputs=['total_all_enrollments'])
+
+    # ===================================================================
+    # COMPUTE THE FEATURE SET
+    # ===================================================================
+    print(f"\n📊 Starting with {len(integrated_dataset):,} rows and {len(integrated_dataset.columns)} columns")
+    print(f"   Registry: {len(FEATURE_REGISTRY)} features; plan: "
+          f"{[len(_stage) for _stage in plan_features(list(FEATURE_REGISTRY))]} features per dependency stage\n")
+
+    feature_values, feature_timings = compute_features(integrated_dataset)
+
+    # Dataset columns (replaced by their prepared versions) followed by the engineered features.
+    # copy=False keeps one array per column, so features loaded from the store stay read-only
+    # views of their memory-mapped files instead of being copied into a consolidated block
+    modeling_df = pd.DataFrame(
+        {**{_col: feature_values.get(_col, integrated_dataset[_col]) for _col in integrated_dataset.columns},
+         **{_name: _values for _name, _values in feature_values.items() if FEATURE_REGISTRY[_name].group != 'prepared'}},
+        copy=False)
+
+    print("🎯 Target Variable: enrollment_complete")
+    print("-" * 60)
+    print(f"Target variable distribution:")
+    print(f"  Complete (1): {modeling_df['enrollment_complete'].sum():,} ({modeling_df['enrollment_complete'].mean()*100:.2f}%)")
+    print(f"  Incomplete (0): {(modeling_df['enrollment_complete'] == 0).sum():,} ({(1-modeling_df['enrollment_complete'].mean())*100:.2f}%)")
+
+    # ===================================================================
+    # SUMMARY OF ENGINEERED FEATURES
+    # ===================================================================
+    print("\n" + "=" * 60)
+    print("📋 FEATURE ENGINEERING COMPLETE")
+    print("=" * 60)
+
+    new_feature_cols = [_name for _group in FEATURE_GROUPS for _name, _spec in FEATURE_REGISTRY.items()
+                        if _spec.group == _group]
+
+    print(f"\n✨ Total engineered features: {len(new_feature_cols)}")
+    print(f"   Dataset shape: {modeling_df.shape}")
+    print(f"\n   Feature categories:")
+    for _group in FEATURE_GROUPS:
+        _names = [_name for _name in new_feature_cols if FEATURE_REGISTRY[_name].group == _group]
+        print(f"   - {_group}: {len(_names)} ({', '.join(_names)})")
+
+    # Where the time goes: slowest features first, then totals by group
+    print(f"\n⏱️  Feature timings ({feature_timings['seconds'].sum():.3f}s summed over "
+          f"{len(feature_timings)} column reads and features):")
+    print(feature_timings.sort_values('seconds', ascending=False).head(10).round(4).to_string(index=False))
+    print(feature_timings.groupby('group')['seconds'].sum().sort_values(ascending=False).round(4).to_string())
+
+    # Feature store: what was loaded, what was rebuilt, and where each feature comes from
+    if FEATURE_STORE:
+        _status = feature_timings.loc[feature_timings['group'] != 'column', 'store'].value_counts()
+        _listing = feature_store_listing(feature_timings.attrs['fingerprints'])
+        print(f"\n💾 Feature store ({FEATURE_STORE_DIR}/): {_status.get('hit', 0)} definitions loaded, "
+              f"{_status.get('built', 0)} built; {len(_listing)} features stored, "
+              f"{_listing['MB'].sum():.1f} MB, {int(_listing['current'].sum())} current")
+        _built = feature_timings[feature_timings['store'] == 'built']
+        if len(_built) and _status.get('hit', 0):
+            print(f"   Rebuilt: {', '.join(_built['name'])}")
+        _unstored = feature_timings[feature_timings['store'] == 'unstored']
+        if len(_unstored):
+            print(f"⚠️  Not stored (object values are recomputed every run): {', '.join(_unstored['name'])}")
+        print(_listing[['feature', 'definition', 'inputs', 'upstream_features', 'builds', 'build_seconds']]
+              .round(4).to_string(index=False))
+
+    print(f"\n✅ Feature engineering successful!")
@@ -1,27 +1,21 @@
 import pandas as pd
 
-# Load all biometric CSV files
-biometric_files = [
-    'api_data_aadhar_biometric_0_500000.csv',
-    'api_data_aadhar_biometric_500000_1000000.csv',
-    'api_data_aadhar_biometric_1000000_1500000.csv',
-    'api_data_aadhar_biometric_1500000_1861108.csv'
-]
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
+else:
+    # Biometric shards are parsed in parallel by the Shard Ingestion Engine and opened
+    # from the memory-mapped column store, so workers on one host share the pages
+    biometric_data = open_column_store('biometric')
 
-bio_dfs = []
-for bio_file in biometric_files:
-    _df = pd.read_csv(bio_file)
-    bio_dfs.append(_df)
-    print(f"Loaded {bio_file}: {len(_df)} rows, {len(_df.columns)} columns")
+    bio_shard_stats = shard_stats[shard_stats['source'] == 'biometric']
+    for _row in bio_shard_stats.itertuples():
+        print(f"Loaded {_row.shard}: {_row.rows} rows in {_row.seconds:.2f}s ({_row.rows_per_sec:,} rows/s)")
 
-# Combine biometric data
-biometric_data = pd.concat(bio_dfs, ignore_index=True)
-
-print(f"\n✅ Combined Biometric Data:")
-print(f"Total rows: {len(biometric_data):,}")
-print(f"Total columns: {len(biometric_data.columns)}")
-print(f"\nColumns: {list(biometric_data.columns)}")
-print(f"\nFirst few rows:")
-print(biometric_data.head())
-print(f"\nData types:")
-print(biometric_data.dtypes)
\ No newline at end of file
+    print(f"\n✅ Combined Biometric Data:")
+    print(f"Total rows: {len(biometric_data):,}")
+    print(f"Total columns: {len(biometric_data.columns)}")
+    print(f"\nColumns: {list(biometric_data.columns)}")
+    print(f"\nFirst few rows:")
+    print(biometric_data.head())
+    print(f"\nData types:")
+    print(biometric_data.dtypes)
\ No newline at end of file
@@ -1,28 +1,21 @@
 import pandas as pd
 
-# Load all demographic CSV files
-demographic_files = [
-    'api_data_aadhar_demographic_0_500000.csv',
-    'api_data_aadhar_demographic_500000_1000000.csv',
-    'api_data_aadhar_demographic_1000000_1500000.csv',
-    'api_data_aadhar_demographic_1500000_2000000.csv',
-    'api_data_aadhar_demographic_2000000_2071700.csv'
-]
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
+else:
+    # Demographic shards are parsed in parallel by the Shard Ingestion Engine and opened
+    # from the memory-mapped column store, so workers on one host share the pages
+    demographic_data = open_column_store('demographic')
 
-demo_dfs = []
-for demo_file in demographic_files:
-    _df = pd.read_csv(demo_file)
-    demo_dfs.append(_df)
-    print(f"Loaded {demo_file}: {len(_df)} rows, {len(_df.columns)} columns")
+    demo_shard_stats = shard_stats[shard_stats['source'] == 'demographic']
+    for _row in demo_shard_stats.itertuples():
+        print(f"Loaded {_row.shard}: {_row.rows} rows in {_row.seconds:.2f}s ({_row.rows_per_sec:,} rows/s)")
 
-# Combine demographic data
-demographic_data = pd.concat(demo_dfs, ignore_index=True)
-
-print(f"\n✅ Combined Demographic Data:")
-print(f"Total rows: {len(demographic_data):,}")
-print(f"Total columns: {len(demographic_data.columns)}")
-print(f"\nColumns: {list(demographic_data.columns)}")
-print(f"\nFirst few rows:")
-print(demographic_data.head())
-print(f"\nData types:")
-print(demographic_data.dtypes)
\ No newline at end of file
+    print(f"\n✅ Combined Demographic Data:")
+    print(f"Total rows: {len(demographic_data):,}")
+    print(f"Total columns: {len(demographic_data.columns)}")
+    print(f"\nColumns: {list(demographic_data.columns)}")
+    print(f"\nFirst few rows:")
+    print(demographic_data.head())
+    print(f"\nData types:")
+    print(demographic_data.dtypes)
\ No newline at end of file
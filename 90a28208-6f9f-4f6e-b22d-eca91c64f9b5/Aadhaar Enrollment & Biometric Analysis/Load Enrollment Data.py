@@ -1,27 +1,21 @@
 import pandas as pd
-import glob
 
-# Load all enrollment CSV files
-enrollment_files = [
-    'api_data_aadhar_enrolment_0_500000.csv',
-    'api_data_aadhar_enrolment_500000_1000000.csv',
-    'api_data_aadhar_enrolment_1000000_1006029.csv'
-]
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
+else:
+    # Enrollment shards are parsed in parallel by the Shard Ingestion Engine and opened
+    # from the memory-mapped column store, so workers on one host share the pages
+    enrollment_data = open_column_store('enrollment')
 
-enroll_dfs = []
-for enroll_file in enrollment_files:
-    _df = pd.read_csv(enroll_file)
-    enroll_dfs.append(_df)
-    print(f"Loaded {enroll_file}: {len(_df)} rows, {len(_df.columns)} columns")
+    enroll_shard_stats = shard_stats[shard_stats['source'] == 'enrollment']
+    for _row in enroll_shard_stats.itertuples():
+        print(f"Loaded {_row.shard}: {_row.rows} rows in {_row.seconds:.2f}s ({_row.rows_per_sec:,} rows/s)")
 
-# Combine enrollment data
-enrollment_data = pd.concat(enroll_dfs, ignore_index=True)
-
-print(f"\n✅ Combined Enrollment Data:")
-print(f"Total rows: {len(enrollment_data):,}")
-print(f"Total columns: {len(enrollment_data.columns)}")
-print(f"\nColumns: {list(enrollment_data.columns)}")
-print(f"\nFirst few rows:")
-print(enrollment_data.head())
-print(f"\nData types:")
-print(enrollment_data.dtypes)
\ No newline at end of file
+    print(f"\n✅ Combined Enrollment Data:")
+    print(f"Total rows: {len(enrollment_data):,}")
+    print(f"Total columns: {len(enrollment_data.columns)}")
+    print(f"\nColumns: {list(enrollment_data.columns)}")
+    print(f"\nFirst few rows:")
+    print(enrollment_data.head())
+    print(f"\nData types:")
+    print(enrollment_data.dtypes)
\ No newline at end of file
@@ -0,0 +1,300 @@
+import io
+import os
+import json
+import numpy as np
+import pandas as pd
+
+print("=" * 80)
+print("🗄️  MEMORY-MAPPED COLUMN STORE")
+print("=" * 80)
+
+# One .npy file per column, so every process that opens the store maps the same
+# files and shares the OS page cache instead of holding a private pandas copy
+COLUMN_STORE_DIR = '.column_store'
+COLUMN_STORE_VERSION = 4
+DAY_NAT = np.iinfo(np.int32).min  # day-number sentinel for unparseable dates
+
+# Per-source totals kept next to the columns and updated in place by append mode
+AGGREGATE_LEVELS = {'state': ['state'], 'district': ['state', 'district'], 'date': ['date']}
+
+# Blocks whose outputs depend on each source, for the append-mode change report
+SOURCE_CONSUMERS = {
+    'enrollment': ['Regional Enrollment Analysis', 'Age and Gender Demographics', 'Regional Heatmap Visualizations',
+                   'Enrollment Trends Over Time', 'Comprehensive Visualization Summary'],
+    'demographic': ['Age and Gender Demographics', 'Enrollment Trends Over Time', 'Comprehensive Visualization Summary'],
+    'biometric': ['Biometric Modality Analysis', 'Age and Gender Demographics', 'Enrollment Trends Over Time',
+                  'Comprehensive Visualization Summary']
+}
+ALL_SOURCE_CONSUMERS = ['Merge Datasets and Validate', 'Statistical Summaries and Data Quality',
+                        'Data Quality Dashboard', 'Feature Engineering and Target Creation']
+
+
+def day_number_values(dates):
+    """Return a nullable Int32 date column as int32 with DAY_NAT in the missing slots."""
+    return dates.to_numpy(dtype=np.int32, na_value=DAY_NAT)
+
+
+def column_values(column):
+    """Return (numpy values, missing mask or None) of a plain or nullable integer column.
+
+    Missing slots of a nullable column hold 0; its mask is stored next to it as
+    <column>.mask.npy.
+    """
+    if isinstance(column.dtype, pd.api.extensions.ExtensionDtype):
+        return column.to_numpy(dtype=column.dtype.numpy_dtype, na_value=0), column.isna().to_numpy()
+    return column.to_numpy(), None
+
+
+def source_fingerprint(source):
+    """Return the size/mtime signature of a source's shards, used to skip unchanged rebuilds."""
+    fingerprint = []
+    for path in discover_shards(source):
+        st = os.stat(path)
+        fingerprint.append([os.path.basename(path), st.st_size, st.st_mtime_ns])
+    return fingerprint
+
+
+def save_column(path, values):
+    """Write one column array, replacing any previous file atomically.
+
+    Readers that already mapped the old file keep their (now unlinked) inode.
+    """
+    with open(path + '.tmp', 'wb') as fh:
+        np.save(fh, np.ascontiguousarray(values))
+    os.replace(path + '.tmp', path)
+
+
+def append_column(path, values):
+    """Append values to a 1-D .npy file in place, rewriting only its header.
+
+    The data is written before the header, so an interrupted append leaves the old
+    shape valid. Falls back to a full rewrite if the new header no longer fits.
+    """
+    values = np.ascontiguousarray(values)
+    with open(path, 'r+b') as fh:
+        version = np.lib.format.read_magic(fh)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(fh)
+        data_offset = fh.tell()
+        if dtype != values.dtype or fortran_order or len(shape) != 1:
+            raise ValueError(f"cannot append {values.dtype} values to {path} ({dtype}, shape {shape})")
+
+        header = io.BytesIO()
+        write_header = np.lib.format.write_array_header_1_0 if version == (1, 0) else np.lib.format.write_array_header_2_0
+        write_header(header, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False,
+                              'shape': (shape[0] + len(values),)})
+        if len(header.getvalue()) == data_offset:
+            fh.seek(data_offset + shape[0] * dtype.itemsize)
+            fh.write(values.tobytes())
+            fh.flush()
+            fh.seek(0)
+            fh.write(header.getvalue())
+            return
+    save_column(path, np.concatenate([np.load(path), values]))
+
+
+def source_aggregates(source, frame):
+    """Return {level: count-column sums plus a records count} by state, district and date."""
+    count_cols = SOURCE_SCHEMAS[source]['count_columns']
+    counts = frame[count_cols].astype('Int64').assign(records=1)
+    keys = {col: frame[col].astype(object) if col in CATEGORICAL_COLUMNS else frame[col]
+            for col in ['state', 'district', 'date']}
+    return {level: counts.groupby([keys[col] for col in cols]).sum() for level, cols in AGGREGATE_LEVELS.items()}
+
+
+def save_aggregates(source_dir, aggregates):
+    """Write each aggregate level as a small CSV table."""
+    for level, table in aggregates.items():
+        path = os.path.join(source_dir, f'agg_{level}.csv')
+        table.reset_index().to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+
+def load_source_aggregates(source, store_dir=COLUMN_STORE_DIR):
+    """Return the persisted {level: totals} of a source without touching its rows."""
+    source_dir = os.path.join(store_dir, source)
+    aggregates = {}
+    for level, cols in AGGREGATE_LEVELS.items():
+        table = pd.read_csv(os.path.join(source_dir, f'agg_{level}.csv'),
+                            dtype={'state': str, 'district': str, 'date': 'Int32'})
+        aggregates[level] = table.set_index(cols)
+    return aggregates
+
+
+def build_column_store(frames, store_dir=COLUMN_STORE_DIR, force=False):
+    """Persist each source frame as one .npy array per column and return the sources rebuilt."""
+    rebuilt = []
+    for source, frame in frames.items():
+        source_dir = os.path.join(store_dir, source)
+        meta_path = os.path.join(source_dir, 'meta.json')
+        fingerprint = source_fingerprint(source)
+        if not force and os.path.exists(meta_path):
+            with open(meta_path) as fh:
+                meta = json.load(fh)
+            # Edited region name tables relabel rows, so they invalidate the store too
+            if (meta.get('version') == COLUMN_STORE_VERSION and meta.get('fingerprint') == fingerprint
+                    and meta.get('region_maps') == region_maps_fingerprint()):
+                continue
+
+        os.makedirs(source_dir, exist_ok=True)
+        columns = {}
+        for col in frame.columns:
+            if col == 'date':
+                values, kind = day_number_values(frame[col]), 'day_number'
+            elif col in CATEGORICAL_COLUMNS:
+                values, kind = frame[col].cat.codes.values, 'codes'
+            else:
+                values, mask = column_values(frame[col])
+                kind = 'values' if mask is None else 'nullable'
+                if mask is not None:
+                    save_column(os.path.join(source_dir, col + '.mask.npy'), mask)
+            save_column(os.path.join(source_dir, col + '.npy'), values)
+            columns[col] = {'kind': kind, 'dtype': str(values.dtype)}
+
+        save_aggregates(source_dir, source_aggregates(source, frame))
+
+        meta = {
+            'version': COLUMN_STORE_VERSION,
+            'fingerprint': fingerprint,
+            'region_maps': region_maps_fingerprint(),
+            'rows': len(frame),
+            'columns': columns,
+            'categories': {col: frame[col].cat.categories.tolist() for col in CATEGORICAL_COLUMNS}
+        }
+        # meta.json is written last and marks the source as complete
+        with open(meta_path + '.tmp', 'w') as fh:
+            json.dump(meta, fh)
+        os.replace(meta_path + '.tmp', meta_path)
+        rebuilt.append(source)
+    return rebuilt
+
+
+def append_column_store(frames, store_dir=COLUMN_STORE_DIR):
+    """Append new rows of each source to its columns and aggregates in place.
+
+    New state/district labels are added to the end of the categories, so existing
+    codes stay valid. Returns {source: change summary} for the rows appended.
+    """
+    changes = {}
+    for source, frame in frames.items():
+        source_dir = os.path.join(store_dir, source)
+        meta_path = os.path.join(source_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"no column store for '{source}' at {source_dir}; run a full ingest first")
+        with open(meta_path) as fh:
+            meta = json.load(fh)
+
+        for col, info in meta['columns'].items():
+            mask = None
+            if info['kind'] == 'day_number':
+                values = day_number_values(frame[col])
+            elif info['kind'] == 'codes':
+                labels = frame[col].astype(object)
+                categories = meta['categories'][col]
+                categories += sorted(set(labels.dropna()) - set(categories))
+                values = pd.Categorical(labels, categories=categories).codes
+            else:
+                values, mask = column_values(frame[col])
+
+            path = os.path.join(source_dir, col + '.npy')
+            if info['kind'] == 'nullable':
+                append_column(path[:-len('.npy')] + '.mask.npy', np.zeros(len(values), dtype=bool) if mask is None else mask)
+            elif mask is not None and mask.any():
+                # First missing values of a complete column: every stored row is present
+                save_column(path[:-len('.npy')] + '.mask.npy', np.concatenate([np.zeros(meta['rows'], dtype=bool), mask]))
+                info['kind'] = 'nullable'
+            dtype = np.promote_types(info['dtype'], values.dtype)
+            if dtype != np.dtype(info['dtype']):
+                # New codes or counts no longer fit the stored width: widen the whole column
+                save_column(path, np.concatenate([np.load(path).astype(dtype), values.astype(dtype)]))
+                info['dtype'] = str(dtype)
+            else:
+                append_column(path, values.astype(dtype))
+
+        new_totals = source_aggregates(source, frame)
+        totals = load_source_aggregates(source, store_dir)
+        save_aggregates(source_dir, {level: totals[level].add(new_totals[level], fill_value=0).astype('int64')
+                                     for level in AGGREGATE_LEVELS})
+
+        meta['rows'] += len(frame)
+        meta['fingerprint'] = source_fingerprint(source)
+        meta['region_maps'] = region_maps_fingerprint()
+        with open(meta_path + '.tmp', 'w') as fh:
+            json.dump(meta, fh)
+        os.replace(meta_path + '.tmp', meta_path)
+
+        changes[source] = {
+            'rows_added': len(frame),
+            'states_changed': len(new_totals['state']),
+            'districts_changed': len(new_totals['district']),
+            'dates_changed': len(new_totals['date']),
+            'new_dates': len(new_totals['date'].index.difference(totals['date'].index))
+        }
+    return changes
+
+
+def open_column_store(source, store_dir=COLUMN_STORE_DIR, columns=None, decode_dates=False):
+    """Open a source as a DataFrame whose columns are read-only views of memory-mapped arrays.
+
+    Counts, pincode, their missing-value masks, the day numbers and the state/district
+    category codes are not copied; only the date missing-value mask is built. With
+    decode_dates=True the day numbers are decoded into a datetime column instead.
+    """
+    source_dir = os.path.join(store_dir, source)
+    with open(os.path.join(source_dir, 'meta.json')) as fh:
+        meta = json.load(fh)
+
+    data = {}
+    for col in columns or list(meta['columns']):
+        kind = meta['columns'][col]['kind']
+        values = np.load(os.path.join(source_dir, col + '.npy'), mmap_mode='r')
+        if kind == 'codes':
+            data[col] = pd.Categorical.from_codes(values, categories=meta['categories'][col], validate=False)
+        elif kind == 'day_number':
+            days = pd.arrays.IntegerArray(values, values == DAY_NAT)
+            data[col] = decode_day_numbers(days) if decode_dates else days
+        elif kind == 'nullable':
+            data[col] = pd.arrays.IntegerArray(values, np.load(os.path.join(source_dir, col + '.mask.npy'), mmap_mode='r'))
+        else:
+            data[col] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def column_store_rows(source, store_dir=COLUMN_STORE_DIR):
+    """Return the number of rows stored for a source."""
+    with open(os.path.join(store_dir, source, 'meta.json')) as fh:
+        return json.load(fh)['rows']
+
+
+def column_store_nbytes(source, store_dir=COLUMN_STORE_DIR):
+    """Return the on-disk size of a source's column files in bytes."""
+    source_dir = os.path.join(store_dir, source)
+    return sum(os.path.getsize(os.path.join(source_dir, f)) for f in os.listdir(source_dir) if f.endswith('.npy'))
+
+
+# ===================================================================
+# BUILD, APPEND TO, OR REUSE THE STORE
+# ===================================================================
+if ingested_sources is None:
+    rebuilt_sources, store_changes = [], None
+    print("\nSkipped: streaming mode does not materialize the sources")
+elif append_shards is not None:
+    rebuilt_sources, store_changes = [], append_column_store(ingested_sources)
+    print(f"\n➕ Appended to column store: {COLUMN_STORE_DIR}")
+    for _source, _change in store_changes.items():
+        print(f"  {_source:12s}: +{_change['rows_added']:,} rows, {_change['states_changed']} states, "
+              f"{_change['districts_changed']} districts, {_change['dates_changed']} dates updated "
+              f"({_change['new_dates']} new dates)")
+    _stale_blocks = list(dict.fromkeys(
+        [_block for _source in store_changes for _block in SOURCE_CONSUMERS[_source]] +
+        (ALL_SOURCE_CONSUMERS if store_changes else [])))
+    print(f"\nOutputs changed by this append ({len(_stale_blocks)} blocks): {_stale_blocks or 'none'}")
+else:
+    rebuilt_sources, store_changes = build_column_store(ingested_sources), None
+
+if ingested_sources is not None:
+    print(f"\n📦 Column store: {COLUMN_STORE_DIR}")
+    for _source in SOURCE_SCHEMAS:
+        _status = 'rebuilt' if _source in rebuilt_sources else 'up to date'
+        print(f"  {_source:12s}: {column_store_rows(_source):,} rows, "
+              f"{column_store_nbytes(_source) / 1e6:.1f} MB on disk ({_status})")
@@ -0,0 +1,353 @@
+import base64
+import hashlib
+import numpy as np
+import pandas as pd
+
+print("=" * 80)
+print("🧮 MERGEABLE SKETCHES")
+print("=" * 80)
+
+# Small fixed-size summaries built per shard and merged across shards and
+# processes. Each answers its query with a stated error bound:
+#   TDigest       quantiles and counts above a value (exact while a column has
+#                 at most TDIGEST_COMPRESSION distinct values)
+#   HyperLogLog   distinct counts, relative standard error 1.04 / sqrt(2**HLL_PRECISION)
+#   CountMin      per-key totals, overestimate ≤ e / COUNT_MIN_WIDTH of the total
+#                 with probability 1 - e**-COUNT_MIN_DEPTH
+#   SpaceSaving   top-K keys by weight, each with a deterministic error bound
+SKETCH_VERSION = 1
+TDIGEST_COMPRESSION = 500
+HLL_PRECISION = 14
+COUNT_MIN_WIDTH = 2048
+COUNT_MIN_DEPTH = 4
+TOP_K_CAPACITY = 1024
+
+_SPLITMIX_CONSTANTS = [np.uint64(0x9E3779B97F4A7C15), np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB)]
+
+
+def hash64(values):
+    """Return the splitmix64 hash of integer values as uint64."""
+    x = np.asarray(values).astype(np.uint64) + _SPLITMIX_CONSTANTS[0]
+    x = (x ^ (x >> np.uint64(30))) * _SPLITMIX_CONSTANTS[1]
+    x = (x ^ (x >> np.uint64(27))) * _SPLITMIX_CONSTANTS[2]
+    return x ^ (x >> np.uint64(31))
+
+
+def hash_labels(labels):
+    """Return a stable 64-bit hash of each label (one blake2b call per label, not per row)."""
+    return np.array([int.from_bytes(hashlib.blake2b(str(label).encode(), digest_size=8).digest(), 'little')
+                     for label in labels], dtype=np.uint64)
+
+
+def encode_array(values):
+    return {'dtype': str(values.dtype), 'data': base64.b64encode(np.ascontiguousarray(values).tobytes()).decode()}
+
+
+def decode_array(encoded):
+    return np.frombuffer(base64.b64decode(encoded['data']), dtype=encoded['dtype']).copy()
+
+
+class TDigest:
+    """Quantile sketch: weighted centroids, small near the tails and large in the middle.
+
+    Values are pre-aggregated into (value, count) pairs, so a column with few
+    distinct values (all the age-group counts) stays exact. Above that, adjacent
+    centroids are combined when they fall in the same unit of the arcsine scale
+    function; the rank error of a quantile is the weight of the two centroids
+    it is interpolated between.
+    """
+
+    def __init__(self, means=None, weights=None, exact=True):
+        self.means = np.zeros(0) if means is None else np.asarray(means, dtype=np.float64)
+        self.weights = np.zeros(0, dtype=np.int64) if weights is None else np.asarray(weights, dtype=np.int64)
+        self.exact = exact
+
+    @property
+    def count(self):
+        return int(self.weights.sum())
+
+    def update(self, values):
+        values, counts = np.unique(np.asarray(values, dtype=np.float64), return_counts=True)
+        self._absorb(values, counts)
+        return self
+
+    def merge(self, *others):
+        """Absorb other digests; merging all shards at once compresses once and keeps the tails tighter."""
+        if not others:
+            return self
+        self._absorb(np.concatenate([other.means for other in others]),
+                     np.concatenate([other.weights for other in others]), all(other.exact for other in others))
+        return self
+
+    def _absorb(self, means, weights, exact=True):
+        means, inverse = np.unique(np.concatenate([self.means, means]), return_inverse=True)
+        weights = np.bincount(inverse, weights=np.concatenate([self.weights, weights]), minlength=len(means))
+        self.means, self.weights = means, weights.astype(np.int64)
+        self.exact = self.exact and exact
+        if len(self.means) > TDIGEST_COMPRESSION:
+            self._compress()
+
+    def _compress(self):
+        total = self.weights.sum()
+        q_left = (np.cumsum(self.weights) - self.weights) / total
+        unit = np.floor(TDIGEST_COMPRESSION / (2 * np.pi) * np.arcsin(2 * q_left - 1))
+        starts = np.flatnonzero(np.diff(unit, prepend=np.nan) != 0)
+        weights = np.add.reduceat(self.weights, starts)
+        self.means = np.add.reduceat(self.means * self.weights, starts) / weights
+        self.weights, self.exact = weights, False
+
+    def quantile(self, q):
+        """Return (q-quantile, rank error as a fraction of the count); exact digests interpolate like pandas."""
+        if not self.count:
+            return np.nan, 0.0
+        cumulative = np.cumsum(self.weights)
+        if self.exact:
+            position = (self.count - 1) * q
+            low, high = self.means[np.searchsorted(cumulative, [np.floor(position), np.ceil(position)], side='right')]
+            return float(low + (high - low) * (position - np.floor(position))), 0.0
+        centers = cumulative - self.weights / 2
+        rank = q * self.count
+        # The estimate interpolates between the two centroids around the rank
+        right = min(int(np.searchsorted(centers, rank)), len(self.weights) - 1)
+        error = self.weights[max(right - 1, 0):right + 1].sum()
+        return float(np.interp(rank, centers, self.means)), float(error / self.count)
+
+    def count_above(self, threshold):
+        """Return (values above threshold, absolute error)."""
+        above = self.means > threshold
+        if self.exact:
+            return int(self.weights[above].sum()), 0
+        # Values of the centroids nearest the threshold could fall on either side of it
+        nearest = np.searchsorted(self.means, threshold)
+        return int(self.weights[above].sum()), int(self.weights[max(nearest - 1, 0):nearest + 1].sum())
+
+    def to_dict(self):
+        return {'kind': 'TDigest', 'means': encode_array(self.means), 'weights': encode_array(self.weights),
+                'exact': self.exact}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(decode_array(state['means']), decode_array(state['weights']), state['exact'])
+
+
+class HyperLogLog:
+    """Distinct-count sketch: 2**precision one-byte registers, merged by taking the maximum."""
+
+    def __init__(self, registers=None, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8) if registers is None else registers
+
+    @property
+    def relative_error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def update(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.int64)
+        tail = (hashes & np.uint64((1 << tail_bits) - 1)).astype(np.float64)  # < 2**53, so exact
+        # Rank = position of the first set bit in the tail (frexp gives the highest bit)
+        rank = np.where(tail > 0, tail_bits - (np.frexp(tail)[1] - 1), tail_bits + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, *others):
+        for other in others:
+            np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        raw = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        # Linear counting is more accurate while many registers are still empty
+        return int(round(m * np.log(m / empty) if raw <= 2.5 * m and empty else raw))
+
+    def to_dict(self):
+        return {'kind': 'HyperLogLog', 'precision': self.precision, 'registers': encode_array(self.registers)}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(decode_array(state['registers']), state['precision'])
+
+
+class CountMin:
+    """Point-query sketch of per-key totals: depth rows of width counters, merged by adding."""
+
+    def __init__(self, table=None, total=0):
+        self.table = np.zeros((COUNT_MIN_DEPTH, COUNT_MIN_WIDTH), dtype=np.int64) if table is None else table
+        self.total = int(total)
+
+    def _columns(self, hashes):
+        return [(hash64(hashes ^ np.uint64(row + 1)) % np.uint64(self.table.shape[1])).astype(np.int64)
+                for row in range(self.table.shape[0])]
+
+    def update(self, hashes, weights):
+        weights = np.asarray(weights, dtype=np.int64)
+        for row, columns in enumerate(self._columns(np.asarray(hashes, dtype=np.uint64))):
+            np.add.at(self.table[row], columns, weights)
+        self.total += int(weights.sum())
+        return self
+
+    def merge(self, *others):
+        for other in others:
+            self.table += other.table
+            self.total += other.total
+        return self
+
+    def query(self, hashes):
+        """Return (estimated totals, overestimate bound) for keys given by their hashes."""
+        hashes = np.atleast_1d(np.asarray(hashes, dtype=np.uint64))
+        estimates = np.min([self.table[row, columns] for row, columns in enumerate(self._columns(hashes))], axis=0)
+        return estimates, int(np.ceil(np.e / self.table.shape[1] * self.total))
+
+    def to_dict(self):
+        return {'kind': 'CountMin', 'table': encode_array(self.table.ravel()), 'shape': list(self.table.shape),
+                'total': self.total}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(decode_array(state['table']).reshape(state['shape']), state['total'])
+
+
+class SpaceSaving:
+    """Top-K sketch keeping at most capacity keys with an upper estimate and an error each.
+
+    A key's true weight lies in [estimate - error, estimate]; a key not kept has
+    weight at most bound. Merging adds estimates, charging each side's bound
+    for keys it does not hold, so the bounds stay deterministic.
+    """
+
+    def __init__(self, items=None, bound=0, capacity=TOP_K_CAPACITY):
+        self.items, self.bound, self.capacity = dict(items or {}), int(bound), capacity
+
+    def update(self, keys, weights):
+        """Add exact per-key weights (e.g. one shard's totals by key)."""
+        other = SpaceSaving({key: (int(weight), 0) for key, weight in zip(keys, weights)}, 0, self.capacity)
+        return self.merge(other)
+
+    def merge(self, *others):
+        for other in others:
+            self._merge_one(other)
+        return self
+
+    def _merge_one(self, other):
+        items = {}
+        for key in self.items.keys() | other.items.keys():
+            estimate, error = self.items.get(key, (self.bound, self.bound))
+            other_estimate, other_error = other.items.get(key, (other.bound, other.bound))
+            items[key] = (estimate + other_estimate, error + other_error)
+        self.bound += other.bound
+        kept = sorted(items.items(), key=lambda item: item[1][0], reverse=True)
+        if len(kept) > self.capacity:
+            self.bound = max(self.bound, kept[self.capacity][1][0])
+        self.items = dict(kept[:self.capacity])
+
+    def top(self, n):
+        """Return the n heaviest keys with their estimates and error bounds."""
+        kept = sorted(self.items.items(), key=lambda item: item[1][0], reverse=True)[:n]
+        return pd.DataFrame([{'key': key, 'estimate': estimate, 'error': error} for key, (estimate, error) in kept])
+
+    def to_dict(self):
+        return {'kind': 'SpaceSaving', 'items': [[key, *value] for key, value in self.items.items()],
+                'bound': self.bound, 'capacity': self.capacity}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls({key: (estimate, error) for key, estimate, error in state['items']}, state['bound'], state['capacity'])
+
+
+SKETCH_TYPES = {cls.__name__: cls for cls in [TDigest, HyperLogLog, CountMin, SpaceSaving]}
+
+
+def district_pairs(frame):
+    """Return ('State / District' label of each district present, per-row pair code or -1)."""
+    state_codes = frame['state'].cat.codes.to_numpy().astype(np.int64)
+    district_codes = frame['district'].cat.codes.to_numpy().astype(np.int64)
+    valid = (state_codes >= 0) & (district_codes >= 0)
+    pairs = state_codes * len(frame['district'].cat.categories) + district_codes
+    present, inverse = np.unique(pairs[valid], return_inverse=True)
+    codes = np.full(len(frame), -1, dtype=np.int64)
+    codes[valid] = inverse
+    states = frame['state'].cat.categories[present // len(frame['district'].cat.categories)]
+    districts = frame['district'].cat.categories[present % len(frame['district'].cat.categories)]
+    return [f'{state} / {district}' for state, district in zip(states, districts)], codes
+
+
+def build_shard_sketches(frame, count_cols):
+    """Sketch one (normalized) shard: quantiles of every count column, distinct states,
+    districts and pincodes, and the heaviest states and districts by their total count.
+    Missing counts and pincodes are skipped, as in pandas sums and nunique."""
+    totals = frame[count_cols].to_numpy(dtype=np.int64, na_value=0).sum(axis=1)
+    sketches = {'rows': len(frame),
+                'quantiles': {col: TDigest().update(frame[col].dropna().to_numpy()) for col in count_cols}}
+
+    distinct = {}
+    for col in ['state', 'district']:
+        codes = frame[col].cat.codes.to_numpy()
+        distinct[col] = HyperLogLog().update(hash_labels(frame[col].cat.categories[np.unique(codes[codes >= 0])]))
+    distinct['pincode'] = HyperLogLog().update(hash64(np.unique(frame['pincode'].dropna().to_numpy())))
+    sketches['distinct'] = distinct
+
+    state_codes = frame['state'].cat.codes.to_numpy()
+    valid = state_codes >= 0
+    state_totals = np.bincount(state_codes[valid], weights=totals[valid],
+                               minlength=len(frame['state'].cat.categories)).astype(np.int64)
+    present = np.flatnonzero(np.bincount(state_codes[valid], minlength=len(state_totals)))
+    sketches['top_states'] = SpaceSaving().update(frame['state'].cat.categories[present], state_totals[present])
+
+    labels, pair_codes = district_pairs(frame)
+    valid = pair_codes >= 0
+    district_totals = np.bincount(pair_codes[valid], weights=totals[valid], minlength=len(labels)).astype(np.int64)
+    sketches['top_districts'] = SpaceSaving().update(labels, district_totals)
+    sketches['district_totals'] = CountMin().update(hash_labels(labels), district_totals)
+    return sketches
+
+
+def merge_sketches(bundles):
+    """Merge sketch bundles (of one source, or of several for the distinct counts) into a new bundle."""
+    bundles = list(bundles)
+    merged = sketches_from_dict(sketches_to_dict(bundles[0]))
+    merged['rows'] = sum(bundle['rows'] for bundle in bundles)
+    for group, sketches in merged.items():
+        if group == 'rows':
+            continue
+        if isinstance(sketches, dict):
+            for name, sketch in sketches.items():
+                sketch.merge(*[bundle[group][name] for bundle in bundles[1:] if name in bundle[group]])
+        else:
+            sketches.merge(*[bundle[group] for bundle in bundles[1:]])
+    return merged
+
+
+def sketches_to_dict(bundle):
+    """Return a JSON-serializable copy of a sketch bundle."""
+    if hasattr(bundle, 'to_dict'):
+        return bundle.to_dict()
+    if isinstance(bundle, dict):
+        return {key: sketches_to_dict(value) for key, value in bundle.items()}
+    return bundle
+
+
+def sketches_from_dict(state):
+    """Rebuild a sketch bundle written by sketches_to_dict."""
+    if isinstance(state, dict) and state.get('kind') in SKETCH_TYPES:
+        return SKETCH_TYPES[state['kind']].from_dict(state)
+    if isinstance(state, dict):
+        return {key: sketches_from_dict(value) for key, value in state.items()}
+    return state
+
+
+def sketch_quality_report(source_sketches, quantile=0.999):
+    """Return the distinct counts and the per-column outlier check, from merged sketches alone."""
+    union = merge_sketches([{'rows': 0, 'distinct': bundle['distinct']} for bundle in source_sketches.values()])
+    distinct = pd.DataFrame([{'column': col, 'estimate': hll.estimate(), 'relative_error': round(hll.relative_error, 4)}
+                             for col, hll in union['distinct'].items()]).set_index('column')
+    outliers = []
+    for source, bundle in source_sketches.items():
+        for col, digest in bundle['quantiles'].items():
+            value, rank_error = digest.quantile(quantile)
+            above, above_error = digest.count_above(value)
+            outliers.append({'column': col, 'count': digest.count, f'p{quantile * 100:g}': value,
+                             'rank_error': rank_error, 'above': above, 'above_error': above_error})
+    return distinct, pd.DataFrame(outliers).set_index('column')
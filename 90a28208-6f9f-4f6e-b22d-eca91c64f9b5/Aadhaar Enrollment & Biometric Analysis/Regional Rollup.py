@@ -0,0 +1,191 @@
+import time
+import numpy as np
+import pandas as pd
+
+print("=" * 80)
+print("🏛️  REGIONAL ROLLUP")
+print("=" * 80)
+
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
+else:
+    # Sums, non-missing counts and means of every measure at each level of the
+    # state > district > pincode hierarchy. Rows are factorized once by the three
+    # keys and reduced at that finest level; each coarser level is reduced from
+    # the level below it, so the rows are scanned only once whatever is asked.
+    ROLLUP_KEYS = ['state', 'district', 'pincode']
+    ROLLUP_LEVELS = {'pincode': ['state', 'district', 'pincode'], 'district': ['state', 'district'], 'state': ['state']}
+    # Integer keys spanning at most this many values are coded by offset instead of hashed
+    ROLLUP_MAX_KEY_RANGE = 1 << 24
+
+
+    class RollupLevel:
+        """Groups of one rollup level: their key codes (-1 for missing), rows, and per-measure sums and counts.
+
+        fine_groups maps every finest-level group to its group here, which is how
+        per-group statistics are broadcast back to rows.
+        """
+
+        def __init__(self, keys, codes, rows, sums, counts, fine_groups):
+            self.keys, self.codes, self.rows = keys, codes, rows
+            self.sums, self.counts, self.fine_groups = sums, counts, fine_groups
+            # Groups with a missing key are kept for coarser levels but not reported, as in groupby
+            self.present = np.logical_and.reduce([codes[key] >= 0 for key in keys])
+
+
+    class RegionalRollup:
+        """The state > district > pincode hierarchy of a set of rows and measures, built in one pass.
+
+        measures maps a name to per-row values; missing values are skipped by
+        sums, counts and means. A level is a name from ROLLUP_LEVELS or any list
+        of keys (e.g. ['pincode'] to group pincodes across districts).
+        """
+
+        def __init__(self, state, district, pincode, measures):
+            self.labels, self.categorical, row_codes = {}, {}, {}
+            for key, values in zip(ROLLUP_KEYS, (state, district, pincode)):
+                self.categorical[key] = isinstance(values.dtype, pd.CategoricalDtype)
+                if self.categorical[key]:
+                    row_codes[key], self.labels[key] = values.cat.codes.to_numpy(), values.cat.categories
+                else:
+                    row_codes[key], self.labels[key] = self._key_codes(values)
+            self.measures, self.integer = list(measures), {}
+
+            # Finest groups are numbered by first appearance, saving a reorder of every row;
+            # coarser levels and tables are in key order
+            self.row_groups, codes = self._group(row_codes, ROLLUP_KEYS, sort=False)
+            groups = len(codes[ROLLUP_KEYS[0]])
+            sums, counts = np.zeros((groups, len(measures))), np.zeros((groups, len(measures)), dtype=np.int64)
+            for position, (name, values) in enumerate(measures.items()):
+                values = pd.Series(values, copy=False)
+                self.integer[name] = pd.api.types.is_integer_dtype(values) or pd.api.types.is_bool_dtype(values)
+                values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                valid = ~np.isnan(values)
+                if valid.all():
+                    sums[:, position] = np.bincount(self.row_groups, weights=values, minlength=groups)
+                    counts[:, position] = np.bincount(self.row_groups, minlength=groups)
+                else:
+                    sums[:, position] = np.bincount(self.row_groups[valid], weights=values[valid], minlength=groups)
+                    counts[:, position] = np.bincount(self.row_groups[valid], minlength=groups)
+            finest = RollupLevel(ROLLUP_KEYS, codes, np.bincount(self.row_groups, minlength=groups),
+                                 sums, counts, np.arange(groups))
+            self._levels = {tuple(ROLLUP_KEYS): finest}
+            # Coarser levels, each reduced from the one below it
+            for keys in ROLLUP_LEVELS.values():
+                self.level(keys)
+
+        @staticmethod
+        def _key_codes(values):
+            """Return (codes, labels) of a non-categorical key, -1 coding a missing value."""
+            values = pd.Series(values, copy=False)
+            if pd.api.types.is_integer_dtype(values) and not values.hasnans and len(values):
+                low, high = int(values.min()), int(values.max())
+                if high - low < ROLLUP_MAX_KEY_RANGE:
+                    # Code i is the value low + i: no hashing, and codes sort like the values
+                    return values.to_numpy(dtype=np.int64) - low, np.arange(low, high + 1)
+            return pd.factorize(values, sort=True)
+
+        def _group(self, codes, keys, sort=True):
+            """Factorize the key-code combinations of items; return (group of each item, key codes of each group).
+
+            With sort, groups are numbered in key order, like a sorted groupby.
+            """
+            packed = np.zeros(len(codes[keys[0]]), dtype=np.int64)
+            for key in keys:
+                # In place: the narrow codes are widened as they are added
+                packed *= len(self.labels[key]) + 1
+                packed += codes[key]
+                packed += 1
+            groups, uniques = pd.factorize(packed, sort=sort)
+            # The key codes of a group are unpacked from its packed key, not gathered from the items
+            group_codes = {}
+            for key in reversed(keys):
+                uniques, group_codes[key] = np.divmod(uniques, len(self.labels[key]) + 1)
+                group_codes[key] -= 1
+            return groups, {key: group_codes[key] for key in keys}
+
+        def level(self, level):
+            """Return the RollupLevel of a level name or key list, reducing the smallest finer level computed."""
+            keys = tuple(ROLLUP_LEVELS[level] if isinstance(level, str) else level)
+            if keys not in self._levels:
+                parent = min((finer for finer in self._levels.values() if set(keys) <= set(finer.keys)),
+                             key=lambda finer: len(finer.rows))
+                groups, codes = self._group(parent.codes, list(keys))
+                size = len(codes[keys[0]])
+                sums, counts = np.zeros((size, len(self.measures))), np.zeros((size, len(self.measures)), dtype=np.int64)
+                for position in range(len(self.measures)):
+                    sums[:, position] = np.bincount(groups, weights=parent.sums[:, position], minlength=size)
+                    counts[:, position] = np.bincount(groups, weights=parent.counts[:, position], minlength=size)
+                rows = np.bincount(groups, weights=parent.rows, minlength=size).astype(np.int64)
+                self._levels[keys] = RollupLevel(list(keys), codes, rows, sums, counts, groups[parent.fine_groups])
+            return self._levels[keys]
+
+        def sizes(self, level):
+            """Return the row count of every group of a level."""
+            return self.level(level).rows
+
+        def sum(self, level, measure):
+            """Return the per-group sum of a measure."""
+            return self.level(level).sums[:, self.measures.index(measure)]
+
+        def count(self, level, measure):
+            """Return the per-group number of non-missing values of a measure."""
+            return self.level(level).counts[:, self.measures.index(measure)]
+
+        def mean(self, level, measure):
+            """Return the per-group mean of a measure (NaN for a group without values)."""
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return self.sum(level, measure) / self.count(level, measure)
+
+        def broadcast(self, level, per_group, fill=np.nan, dtype=np.float64):
+            """Return each row's group statistic; rows missing a key of the level get fill."""
+            level = self.level(level)
+            groups = level.fine_groups[self.row_groups]
+            out = np.full(len(groups), fill, dtype=dtype)
+            member = level.present[groups]
+            out[member] = per_group[groups[member]]
+            return out
+
+        def table(self, level, stat='sum', measures=None):
+            """Return one row per group of a level (indexed by its labels) with rows and a stat of each measure.
+
+            Sums of integer measures are nullable integers, as groupby sums of the nullable count columns.
+            """
+            rollup_level = self.level(level)
+            present = np.flatnonzero(rollup_level.present)
+            present = present[np.lexsort([rollup_level.codes[key][present] for key in reversed(rollup_level.keys)])]
+            # Categorical keys keep their categories, as in groupby(observed=True)
+            index = [pd.Categorical.from_codes(rollup_level.codes[key][present], categories=self.labels[key])
+                     if self.categorical[key] else self.labels[key][rollup_level.codes[key][present]]
+                     for key in rollup_level.keys]
+            index = (pd.Index(index[0], name=rollup_level.keys[0]) if len(index) == 1
+                     else pd.MultiIndex.from_arrays(index, names=rollup_level.keys))
+            table = pd.DataFrame({'rows': rollup_level.rows[present]}, index=index)
+            for name in measures or self.measures:
+                values = getattr(self, stat)(level, name)[present]
+                table[name] = pd.array(values.astype(np.int64), dtype='Int64') if stat == 'sum' and self.integer[name] else values
+            return table
+
+
+    def build_regional_rollup(dataset):
+        """Return the RegionalRollup of dataset with every source's count columns and row indicators."""
+        measures = {}
+        for source in SOURCE_BITS:
+            for col in SOURCE_SCHEMAS[source]['count_columns']:
+                measures[col] = dataset[col]
+            rows = np.zeros(len(dataset), dtype=bool)
+            rows[rows_with_sources(source)] = True
+            measures[f'{source}_rows'] = rows
+        return RegionalRollup(dataset['state'], dataset['district'], dataset['pincode'], measures)
+
+
+    # ===================================================================
+    # ROLL UP THE MERGED DATASET
+    # ===================================================================
+    _start = time.perf_counter()
+    regional_rollup = build_regional_rollup(integrated_dataset)
+    _elapsed = time.perf_counter() - _start
+
+    print(f"\n📐 {len(regional_rollup.measures)} measures over {len(integrated_dataset):,} rows in {_elapsed:.3f}s:")
+    for _name, _keys in reversed(list(ROLLUP_LEVELS.items())):
+        print(f"   {_name:10s} {int(regional_rollup.level(_keys).present.sum()):>8,} groups")
@@ -0,0 +1,764 @@
+import os
+import re
+import glob
+import json
+import time
+import hashlib
+import threading
+import multiprocessing
+from queue import Queue
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow  # noqa: F401  (parquet engine for the shard cache)
+    SHARD_CACHE_AVAILABLE = True
+except ImportError:
+    SHARD_CACHE_AVAILABLE = False
+
+print("=" * 80)
+print("⚙️  SHARD INGESTION ENGINE")
+print("=" * 80)
+
+# ===================================================================
+# 1. PER-SOURCE SCHEMA
+# ===================================================================
+# Shard filename pattern and count columns for each API export
+SOURCE_SCHEMAS = {
+    'enrollment': {
+        'pattern': 'api_data_aadhar_enrolment_*.csv',
+        'count_columns': ['age_0_5', 'age_5_17', 'age_18_greater']
+    },
+    'demographic': {
+        'pattern': 'api_data_aadhar_demographic_*.csv',
+        'count_columns': ['demo_age_5_17', 'demo_age_17_']
+    },
+    'biometric': {
+        'pattern': 'api_data_aadhar_biometric_*.csv',
+        'count_columns': ['bio_age_5_17', 'bio_age_17_']
+    }
+}
+
+# Column types read from the CSV. Pincodes and counts are read as nullable integers,
+# so a blank cell stays missing. After parsing, dates become nullable Int32 day
+# numbers and counts are downcast to the narrowest unsigned type (compact schema);
+# columns without missing values go back to plain numpy integers
+KEY_DTYPES = {'date': 'object', 'state': 'category', 'district': 'category', 'pincode': 'Int32'}
+COUNT_DTYPE = 'Int64'
+CATEGORICAL_COLUMNS = ['state', 'district']
+DATE_FORMAT = '%d-%m-%Y'
+DAY_EPOCH = pd.Timestamp('1970-01-01')
+
+# Downstream blocks add up to 7 count columns row-wise, so a compact count type must
+# hold the largest value this many times over without wrapping around
+COUNT_SUM_HEADROOM = 8
+COUNT_CANDIDATE_DTYPES = ['uint16', 'uint32', 'uint64']
+SIGNED_COUNT_CANDIDATE_DTYPES = ['int16', 'int32', 'int64']
+
+# Columnar cache of parsed shards; bump the version whenever the parsed layout changes
+SHARD_CACHE_DIR = '.shard_cache'
+SHARD_CACHE_VERSION = 3
+
+# 'memory' materializes every source for the in-memory blocks; 'streaming' skips the
+# full ingest so the Streaming Analysis block can summarize shards chunk by chunk;
+# 'append' parses only shards missing from the manifest and appends them to the column store
+PIPELINE_MODE = os.environ.get('AADHAAR_PIPELINE_MODE', 'memory')
+STREAM_CHUNK_ROWS = 250_000
+
+# Shard filenames encode their row range: api_data_aadhar_<source>_<start>_<end>.csv
+SHARD_RANGE_PATTERN = re.compile(r'_(\d+)_(\d+)\.csv$')
+SHARD_MANIFEST_PATH = os.path.join(SHARD_CACHE_DIR, 'manifest.json')
+
+
+def shard_row_range(path):
+    """Return the (start, end) row range encoded in a shard filename, or (None, None)."""
+    match = SHARD_RANGE_PATTERN.search(os.path.basename(path))
+    return (int(match.group(1)), int(match.group(2))) if match else (None, None)
+
+
+def discover_shards(source):
+    """Glob a source's shards, ordered by their starting row."""
+    paths = glob.glob(SOURCE_SCHEMAS[source]['pattern'])
+    return sorted(paths, key=lambda p: (shard_row_range(p)[0] is None, shard_row_range(p)[0] or 0, p))
+
+
+def source_dtypes(source):
+    """Return the read_csv dtype mapping for one source."""
+    dtypes = dict(KEY_DTYPES)
+    dtypes.update({col: COUNT_DTYPE for col in SOURCE_SCHEMAS[source]['count_columns']})
+    return dtypes
+
+
+def encode_day_numbers(dates):
+    """Convert datetimes to nullable Int32 days since 1970-01-01 (<NA> for NaT)."""
+    dates = pd.DatetimeIndex(dates)
+    days = np.where(dates.isna(), 0, dates.values.astype('datetime64[D]').astype(np.int64)).astype(np.int32)
+    return pd.arrays.IntegerArray(days, np.asarray(dates.isna()))
+
+
+def decode_day_numbers(days):
+    """Convert day numbers back to datetime64[ns]; a Series keeps its index."""
+    return pd.to_datetime(days, unit='D')
+
+
+def parse_day_numbers(dates):
+    """Parse date strings into day numbers, parsing and encoding each distinct string once."""
+    codes, uniques = pd.factorize(dates)
+    days = encode_day_numbers(pd.to_datetime(uniques, format=DATE_FORMAT, errors='coerce'))
+    # Missing strings have code -1, which take fills with <NA>
+    return days.take(codes, allow_fill=True)
+
+
+def day_number(date):
+    """Return the day number of a single date-like value."""
+    return (pd.Timestamp(date).normalize() - DAY_EPOCH).days
+
+
+def compact_count_dtype(values):
+    """Return the narrowest integer dtype holding values with COUNT_SUM_HEADROOM to spare (missing values ignored)."""
+    values = pd.array(values).dropna() if isinstance(values, pd.api.extensions.ExtensionArray) else values
+    if len(values) == 0:
+        return np.dtype(COUNT_CANDIDATE_DTYPES[0])
+    low, high = int(values.min()), int(values.max())
+    candidates = COUNT_CANDIDATE_DTYPES if low >= 0 else SIGNED_COUNT_CANDIDATE_DTYPES
+    for dtype in map(np.dtype, candidates):
+        info = np.iinfo(dtype)
+        if high * COUNT_SUM_HEADROOM <= info.max and low * COUNT_SUM_HEADROOM >= info.min:
+            return dtype
+    return np.dtype(candidates[-1])
+
+
+def nullable_cast(column, dtype):
+    """Cast an integer column to dtype, or to the nullable type of the same width if it has missing values."""
+    if column.hasnans:
+        return column.astype(('UInt' if dtype.kind == 'u' else 'Int') + str(dtype.itemsize * 8))
+    return column.astype(dtype)
+
+
+def apply_compact_schema(source, frame):
+    """Turn freshly parsed dates into day numbers and downcast pincodes and the count columns in place."""
+    # Only a few hundred distinct dates exist, so parsing costs O(distinct dates)
+    frame['date'] = parse_day_numbers(frame['date'])
+    frame['pincode'] = nullable_cast(frame['pincode'], np.dtype('int32'))
+    for col in SOURCE_SCHEMAS[source]['count_columns']:
+        frame[col] = nullable_cast(frame[col], compact_count_dtype(frame[col].values))
+    return frame
+
+
+# ===================================================================
+# 2. FINGERPRINTED SHARD CACHE
+# ===================================================================
+def file_content_hash(path, chunk_size=1 << 20):
+    """Return the blake2b digest of a file's bytes."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def shard_cache_paths(path, cache_dir=SHARD_CACHE_DIR):
+    """Return the (parquet, metadata) paths of a shard's cache entry."""
+    stem = os.path.join(cache_dir, os.path.basename(path))
+    return stem + '.parquet', stem + '.json'
+
+
+def lookup_shard_cache(source, path, cache_dir=SHARD_CACHE_DIR):
+    """Return the cached frame for an unchanged shard, or None on a miss.
+
+    Size and mtime are checked first; the content hash is only recomputed when
+    they differ, so a touched but unchanged file still hits and refreshes its entry.
+    """
+    data_path, meta_path = shard_cache_paths(path, cache_dir)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+    with open(meta_path) as fh:
+        meta = json.load(fh)
+    if meta.get('version') != SHARD_CACHE_VERSION or meta.get('schema') != source_dtypes(source):
+        return None
+
+    st = os.stat(path)
+    if meta['size'] != st.st_size:
+        return None
+    if meta['mtime_ns'] != st.st_mtime_ns:
+        if meta['content_hash'] != file_content_hash(path):
+            return None
+        meta['mtime_ns'] = st.st_mtime_ns
+        # Replaced atomically, as in store_shard_cache: a crash mid-write must not leave torn metadata
+        with open(meta_path + '.tmp', 'w') as fh:
+            json.dump(meta, fh)
+        os.replace(meta_path + '.tmp', meta_path)
+    return pd.read_parquet(data_path)
+
+
+def store_shard_cache(source, path, frame, cache_dir=SHARD_CACHE_DIR):
+    """Write a parsed shard and its fingerprint to the cache."""
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path, meta_path = shard_cache_paths(path, cache_dir)
+    st = os.stat(path)
+    meta = {
+        'version': SHARD_CACHE_VERSION,
+        'schema': source_dtypes(source),
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'content_hash': file_content_hash(path),
+        'rows': len(frame)
+    }
+    # Write to temporary names first so a crashed run never leaves a half-written entry
+    frame.to_parquet(data_path + '.tmp', index=False)
+    os.replace(data_path + '.tmp', data_path)
+    with open(meta_path + '.tmp', 'w') as fh:
+        json.dump(meta, fh)
+    os.replace(meta_path + '.tmp', meta_path)
+
+
+# ===================================================================
+# 3. SHARD READER
+# ===================================================================
+def parse_shard(source, path):
+    """Parse one CSV shard with its source schema."""
+    dtypes = source_dtypes(source)
+    frame = pd.read_csv(path, dtype=dtypes, usecols=list(dtypes))
+    return apply_compact_schema(source, frame)
+
+
+def read_shard(source, path, use_cache=True):
+    """Load one shard from the cache or the CSV and return (frame, stats)."""
+    start = time.perf_counter()
+    use_cache = use_cache and SHARD_CACHE_AVAILABLE
+    frame = lookup_shard_cache(source, path) if use_cache else None
+    cache_status = 'hit' if frame is not None else ('miss' if use_cache else 'off')
+    if frame is None:
+        frame = parse_shard(source, path)
+        if use_cache:
+            store_shard_cache(source, path, frame)
+    elapsed = time.perf_counter() - start
+    stats = {
+        'source': source,
+        'shard': os.path.basename(path),
+        'cache': cache_status,
+        'rows': len(frame),
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round(len(frame) / elapsed) if elapsed > 0 else 0
+    }
+    return frame, stats
+
+
+def iter_shard_chunks(source, chunksize=STREAM_CHUNK_ROWS, paths=None):
+    """Yield a source's rows as typed, name-normalized chunks of at most chunksize rows, shard by shard."""
+    dtypes = source_dtypes(source)
+    region_maps = load_region_maps()
+    for path in paths or discover_shards(source):
+        for chunk in pd.read_csv(path, dtype=dtypes, usecols=list(dtypes), chunksize=chunksize):
+            yield normalize_regions(apply_compact_schema(source, chunk), region_maps)
+    save_region_maps(region_maps)
+
+
+def prefetch(iterator, depth=1):
+    """Yield from iterator while a background thread reads up to depth items ahead."""
+    queue = Queue(maxsize=depth)
+    done = object()
+
+    def produce():
+        try:
+            for item in iterator:
+                queue.put(item)
+        except BaseException as exc:  # re-raised in the consumer
+            queue.put(exc)
+        finally:
+            queue.put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = queue.get()
+        if item is done:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+
+# ===================================================================
+# 4. STATE AND DISTRICT NAME NORMALIZATION
+# ===================================================================
+# Editable lookup tables: every raw spelling seen at ingest gets a row, and the
+# canonical column can be corrected (or filled in for unmapped states) by hand
+REGION_MAP_DIR = 'region_maps'
+STATE_MAP_PATH = os.path.join(REGION_MAP_DIR, 'state_names.csv')
+DISTRICT_MAP_PATH = os.path.join(REGION_MAP_DIR, 'district_names.csv')
+APPLIED_REGION_MAPS_PATH = os.path.join(SHARD_CACHE_DIR, 'region_maps.json')
+
+# The 28 states and 8 union territories
+CANONICAL_STATES = [
+    'Andhra Pradesh', 'Arunachal Pradesh', 'Assam', 'Bihar', 'Chhattisgarh', 'Goa', 'Gujarat', 'Haryana',
+    'Himachal Pradesh', 'Jharkhand', 'Karnataka', 'Kerala', 'Madhya Pradesh', 'Maharashtra', 'Manipur',
+    'Meghalaya', 'Mizoram', 'Nagaland', 'Odisha', 'Punjab', 'Rajasthan', 'Sikkim', 'Tamil Nadu', 'Telangana',
+    'Tripura', 'Uttar Pradesh', 'Uttarakhand', 'West Bengal',
+    'Andaman and Nicobar Islands', 'Chandigarh', 'Dadra and Nagar Haveli and Daman and Diu', 'Delhi',
+    'Jammu and Kashmir', 'Ladakh', 'Lakshadweep', 'Puducherry'
+]
+
+# Former names and common misspellings, keyed by region_match_key
+STATE_ALIASES = {
+    'orissa': 'Odisha',
+    'pondicherry': 'Puducherry',
+    'uttaranchal': 'Uttarakhand',
+    'chhatisgarh': 'Chhattisgarh',
+    'telengana': 'Telangana',
+    'westbangal': 'West Bengal',
+    'westbengli': 'West Bengal',
+    'jammukashmir': 'Jammu and Kashmir',
+    'nctofdelhi': 'Delhi',
+    'newdelhi': 'Delhi',
+    'andamanandnicobar': 'Andaman and Nicobar Islands',
+    'dadraandnagarhaveli': 'Dadra and Nagar Haveli and Daman and Diu',
+    'dadranagarhaveli': 'Dadra and Nagar Haveli and Daman and Diu',
+    'damananddiu': 'Dadra and Nagar Haveli and Daman and Diu',
+    'thedadraandnagarhavelianddamananddiu': 'Dadra and Nagar Haveli and Daman and Diu'
+}
+
+
+def region_match_key(label):
+    """Reduce a name to lowercase letters and digits ('&' read as 'and') for matching spellings."""
+    return re.sub(r'[^a-z0-9]', '', str(label).casefold().replace('&', 'and'))
+
+
+def clean_region_label(label):
+    """Strip a label and collapse runs of whitespace."""
+    return ' '.join(str(label).split())
+
+
+CANONICAL_STATE_KEYS = {region_match_key(state): state for state in CANONICAL_STATES}
+
+
+def load_region_maps():
+    """Return {'states': {raw: canonical}, 'districts': {(state, raw): canonical}} from the lookup tables.
+
+    An empty canonical state marks a spelling that could not be mapped.
+    """
+    states, districts = {}, {}
+    if os.path.exists(STATE_MAP_PATH):
+        table = pd.read_csv(STATE_MAP_PATH, dtype=str, keep_default_na=False)
+        states = dict(zip(table['raw_state'], table['state']))
+    if os.path.exists(DISTRICT_MAP_PATH):
+        table = pd.read_csv(DISTRICT_MAP_PATH, dtype=str, keep_default_na=False)
+        districts = dict(zip(zip(table['state'], table['raw_district']), table['district']))
+    return {'states': states, 'districts': districts, 'changed': False}
+
+
+def save_region_maps(region_maps):
+    """Write the lookup tables back if normalization added new spellings to them."""
+    if not region_maps['changed']:
+        return
+    os.makedirs(REGION_MAP_DIR, exist_ok=True)
+    tables = {
+        STATE_MAP_PATH: pd.DataFrame(sorted(region_maps['states'].items()), columns=['raw_state', 'state']),
+        DISTRICT_MAP_PATH: pd.DataFrame([(state, raw, district) for (state, raw), district
+                                         in sorted(region_maps['districts'].items())],
+                                        columns=['state', 'raw_district', 'district'])
+    }
+    for path, table in tables.items():
+        table.to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    region_maps['changed'] = False
+
+
+def region_maps_fingerprint():
+    """Return the content hashes of the two lookup tables (None for a missing table)."""
+    return [file_content_hash(path) if os.path.exists(path) else None for path in (STATE_MAP_PATH, DISTRICT_MAP_PATH)]
+
+
+def record_applied_region_maps():
+    """Remember the lookup tables the ingested data was normalized with."""
+    os.makedirs(SHARD_CACHE_DIR, exist_ok=True)
+    with open(APPLIED_REGION_MAPS_PATH + '.tmp', 'w') as fh:
+        json.dump(region_maps_fingerprint(), fh)
+    os.replace(APPLIED_REGION_MAPS_PATH + '.tmp', APPLIED_REGION_MAPS_PATH)
+
+
+def region_maps_edited():
+    """Return True if the lookup tables changed since the last ingest applied them."""
+    if not os.path.exists(APPLIED_REGION_MAPS_PATH):
+        return True
+    with open(APPLIED_REGION_MAPS_PATH) as fh:
+        return json.load(fh) != region_maps_fingerprint()
+
+
+def resolve_state(raw, region_maps):
+    """Return the canonical name of a raw state spelling ('' if unmapped), adding new spellings to the table."""
+    if raw not in region_maps['states']:
+        key = region_match_key(raw)
+        region_maps['states'][raw] = STATE_ALIASES.get(key, CANONICAL_STATE_KEYS.get(key, ''))
+        region_maps['changed'] = True
+    return region_maps['states'][raw]
+
+
+def unmapped_states(region_maps):
+    """Return the raw state spellings that have no canonical name yet."""
+    return sorted(raw for raw, state in region_maps['states'].items() if not state)
+
+
+def relabel_codes(codes, labels):
+    """Map category codes to a new sorted categorical whose categories are the distinct labels.
+
+    labels[i] is the new label of old code i; code -1 (missing) stays missing.
+    """
+    categories = pd.Index(sorted(set(labels)))
+    lookup = np.append(categories.get_indexer(labels), -1).astype(np.int32)
+    return pd.Categorical.from_codes(lookup[codes], categories=categories, validate=False)
+
+
+def normalize_regions(frame, region_maps):
+    """Replace raw state/district spellings with canonical names by relabelling category codes.
+
+    Each distinct state label and each distinct (state, district) pair is resolved
+    once through the lookup tables; rows are only touched by integer gathers. A
+    new district spelling joins an existing one of the same state whose match key
+    is equal, otherwise its most frequent cleaned spelling becomes canonical.
+    Unmapped states keep their cleaned raw spelling.
+    """
+    state_labels = [resolve_state(raw, region_maps) or clean_region_label(raw) for raw in frame['state'].cat.categories]
+    states = relabel_codes(frame['state'].cat.codes.to_numpy(), state_labels)
+
+    # One id per distinct (canonical state, raw district) pair; -1 codes stay distinct
+    raw_districts = frame['district'].cat.categories
+    state_codes = states.codes.astype(np.int64)
+    district_codes = frame['district'].cat.codes.to_numpy().astype(np.int64)
+    pair_ids, pairs = pd.factorize((state_codes + 1) * (len(raw_districts) + 1) + district_codes + 1)
+    pair_counts = np.bincount(pair_ids, minlength=len(pairs))
+
+    known = {(state, region_match_key(raw)): district for (state, raw), district in region_maps['districts'].items()}
+    pair_labels = [None] * len(pairs)
+    for i in np.argsort(-pair_counts, kind='stable'):
+        state_code, district_code = divmod(int(pairs[i]), len(raw_districts) + 1)
+        if district_code == 0:
+            continue
+        state = states.categories[state_code - 1] if state_code else ''
+        raw = raw_districts[district_code - 1]
+        if (state, raw) not in region_maps['districts']:
+            region_maps['districts'][(state, raw)] = known.setdefault((state, region_match_key(raw)),
+                                                                      clean_region_label(raw))
+            region_maps['changed'] = True
+        pair_labels[i] = region_maps['districts'][(state, raw)]
+
+    district_categories = pd.Index(sorted({label for label in pair_labels if label is not None}))
+    pair_codes = np.array([-1 if label is None else district_categories.get_loc(label) for label in pair_labels],
+                          dtype=np.int32)
+    districts = pd.Categorical.from_codes(pair_codes[pair_ids], categories=district_categories, validate=False)
+    return frame.assign(state=states, district=districts)
+
+
+# ===================================================================
+# 5. SHARD MANIFEST
+# ===================================================================
+def describe_shard(source, path, frame):
+    """Return the manifest entry of a parsed shard: row-range check, date span and states."""
+    start_row, end_row = shard_row_range(path)
+    expected_rows = end_row - start_row if start_row is not None else None
+    st = os.stat(path)
+    min_day, max_day = frame['date'].min(), frame['date'].max()
+    return {
+        'source': source,
+        'shard': os.path.basename(path),
+        'path': path,
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'start_row': start_row,
+        'end_row': end_row,
+        'rows': len(frame),
+        'expected_rows': expected_rows,
+        'rows_match': expected_rows is None or expected_rows == len(frame),
+        'min_date': None if pd.isna(min_day) else decode_day_numbers(int(min_day)).strftime('%Y-%m-%d'),
+        'max_date': None if pd.isna(max_day) else decode_day_numbers(int(max_day)).strftime('%Y-%m-%d'),
+        'states': sorted(frame['state'].dropna().unique().astype(str).tolist())
+    }
+
+
+def load_shard_manifest(path=SHARD_MANIFEST_PATH):
+    """Return the persisted manifest as a DataFrame (empty if none has been written)."""
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=['source', 'shard', 'path', 'size', 'mtime_ns', 'rows', 'states'])
+    with open(path) as fh:
+        return pd.DataFrame(json.load(fh))
+
+
+def save_shard_manifest(entries, path=SHARD_MANIFEST_PATH):
+    """Merge entries into the persisted manifest (one entry per existing shard path) and return it."""
+    manifest = load_shard_manifest(path)
+    known = {row['path']: row for row in manifest.to_dict('records') if os.path.exists(row['path'])}
+    known.update({entry['path']: entry for entry in entries})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as fh:
+        json.dump(list(known.values()), fh, indent=1)
+    os.replace(path + '.tmp', path)
+    return pd.DataFrame(list(known.values()))
+
+
+def refresh_shard_manifest(sources=None, use_cache=True):
+    """Return the manifest for the current shards, describing only new or changed files."""
+    sources = sources or list(SOURCE_SCHEMAS)
+    known = {row['path']: row for row in load_shard_manifest().to_dict('records')}
+    region_maps = load_region_maps()
+    entries, changed = [], []
+    for source in sources:
+        for path in discover_shards(source):
+            st = os.stat(path)
+            entry = known.get(path)
+            if entry is None or entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+                frame = normalize_regions(read_shard(source, path, use_cache)[0], region_maps)
+                entry = describe_shard(source, path, frame)
+                changed.append(entry)
+            entries.append(entry)
+    save_region_maps(region_maps)
+    if changed:
+        save_shard_manifest(changed)
+    return pd.DataFrame(entries)
+
+
+def detect_new_shards(sources=None):
+    """Return ([(source, path)] of shards not yet in the manifest, [(source, path)] of changed or removed ones)."""
+    sources = sources or list(SOURCE_SCHEMAS)
+    known = {row['path']: row for row in load_shard_manifest().to_dict('records') if row['source'] in sources}
+    new_shards, changed_shards = [], []
+    for source in sources:
+        for path in discover_shards(source):
+            entry = known.pop(path, None)
+            if entry is None:
+                new_shards.append((source, path))
+                continue
+            st = os.stat(path)
+            if entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+                changed_shards.append((source, path))
+    # Whatever is left in the manifest no longer exists on disk
+    changed_shards += [(entry['source'], path) for path, entry in known.items()]
+    return new_shards, changed_shards
+
+
+def select_shards(source, start_date=None, end_date=None, states=None, manifest=None):
+    """Return the manifest rows of a source whose date span and states overlap the request."""
+    manifest = refresh_shard_manifest([source]) if manifest is None else manifest
+    selected = manifest[manifest['source'] == source]
+    if start_date is not None:
+        selected = selected[pd.to_datetime(selected['max_date']) >= pd.Timestamp(start_date)]
+    if end_date is not None:
+        selected = selected[pd.to_datetime(selected['min_date']) <= pd.Timestamp(end_date)]
+    if states:
+        wanted = set(states)
+        selected = selected[[bool(wanted.intersection(shard_states)) for shard_states in selected['states']]]
+    return selected
+
+
+def load_partial(source, start_date=None, end_date=None, states=None, use_cache=True):
+    """Read only the shards overlapping a date range / state list and return (rows, shards read)."""
+    selected = select_shards(source, start_date, end_date, states)
+    if selected.empty:
+        return pd.DataFrame(columns=list(source_dtypes(source))), selected
+    region_maps = load_region_maps()
+    frames = unify_categories([normalize_regions(read_shard(source, path, use_cache)[0], region_maps)
+                               for path in selected['path']])
+    save_region_maps(region_maps)
+    frame = pd.concat(frames, ignore_index=True)
+    mask = pd.Series(True, index=frame.index)
+    if start_date is not None:
+        mask &= (frame['date'] >= day_number(start_date)).fillna(False)
+    if end_date is not None:
+        mask &= (frame['date'] <= day_number(end_date)).fillna(False)
+    if states:
+        mask &= frame['state'].isin(states)
+    return frame[mask].reset_index(drop=True), selected
+
+
+def unify_categories(frames):
+    """Give every frame identical state/district categories so concat and merge keep codes."""
+    for col in CATEGORICAL_COLUMNS:
+        categories = union_categoricals([f[col] for f in frames], ignore_order=True).categories.sort_values()
+        for f in frames:
+            f[col] = f[col].cat.set_categories(categories)
+    return frames
+
+
+def ingest_sources(sources=None, max_workers=None, use_cache=True, shards=None):
+    """Read shards in parallel and return (frames by source, shard stats).
+
+    By default every shard of the given sources is read; pass shards=[(source, path), ...]
+    to read only those (sources without a listed shard are left out of the result).
+    """
+    if shards is None:
+        sources = sources or list(SOURCE_SCHEMAS)
+        shards = [(source, path) for source in sources for path in discover_shards(source)]
+    tasks = [(source, path, use_cache) for source, path in shards]
+    workers = max_workers or max(1, min(len(tasks), os.cpu_count() or 1))
+
+    start = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+            results = list(pool.map(read_shard, *zip(*tasks)))
+    else:
+        results = [read_shard(*task) for task in tasks]
+    wall_seconds = time.perf_counter() - start
+
+    frames = {}
+    stats = pd.DataFrame([info for _, info in results],
+                         columns=['source', 'shard', 'cache', 'rows', 'seconds', 'rows_per_sec'])
+    stats.attrs['wall_seconds'] = wall_seconds
+    stats.attrs['workers'] = workers
+    if not results:
+        return frames, stats
+
+    # Name normalization runs here, once, in the parent process that owns the lookup tables
+    region_maps = load_region_maps()
+    normalized = unify_categories([normalize_regions(frame, region_maps) for frame, _ in results])
+    save_region_maps(region_maps)
+    record_applied_region_maps()
+    save_shard_manifest([describe_shard(source, path, frame)
+                         for (source, path, _), frame in zip(tasks, normalized)])
+    # Sketches summarize the normalized labels, so they are built here rather than in the workers
+    stats['sketch'] = ['built' if store_shard_sketches(source, path, frame) else 'hit'
+                       for (source, path, _), frame in zip(tasks, normalized)]
+
+    for source in dict.fromkeys(source for source, _ in shards):
+        shard_frames = [frame for frame, (_, info) in zip(normalized, results) if info['source'] == source]
+        frames[source] = pd.concat(shard_frames, ignore_index=True)
+    return frames, stats
+
+
+# ===================================================================
+# 5b. SHARD SKETCHES
+# ===================================================================
+def shard_sketch_path(path, cache_dir=SHARD_CACHE_DIR):
+    """Return the path of a shard's persisted sketch bundle."""
+    return os.path.join(cache_dir, os.path.basename(path)) + '.sketches.json'
+
+
+def shard_sketch_key(path):
+    """Return what a shard's sketches depend on: the sketch layout, the file, and the region name tables."""
+    st = os.stat(path)
+    return {'version': SKETCH_VERSION, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+            'region_maps': region_maps_fingerprint()}
+
+
+def load_shard_sketches(path, cache_dir=SHARD_CACHE_DIR):
+    """Return the persisted sketch bundle of an unchanged shard, or None."""
+    sketch_path = shard_sketch_path(path, cache_dir)
+    if not os.path.exists(sketch_path):
+        return None
+    with open(sketch_path) as fh:
+        state = json.load(fh)
+    if state['key'] != shard_sketch_key(path):
+        return None
+    return sketches_from_dict(state['sketches'])
+
+
+def store_shard_sketches(source, path, frame, cache_dir=SHARD_CACHE_DIR):
+    """Sketch a normalized shard unless its persisted sketches are still valid; return True if built."""
+    if load_shard_sketches(path, cache_dir) is not None:
+        return False
+    os.makedirs(cache_dir, exist_ok=True)
+    sketch_path = shard_sketch_path(path, cache_dir)
+    state = {'key': shard_sketch_key(path), 'source': source,
+             'sketches': sketches_to_dict(build_shard_sketches(frame, SOURCE_SCHEMAS[source]['count_columns']))}
+    with open(sketch_path + '.tmp', 'w') as fh:
+        json.dump(state, fh)
+    os.replace(sketch_path + '.tmp', sketch_path)
+    return True
+
+
+def merged_shard_sketches(sources=None):
+    """Merge the persisted sketches of every discovered shard into {source: bundle}.
+
+    Shards without valid sketches are left out; their names are returned as the second item.
+    """
+    merged, missing = {}, []
+    for source in sources or list(SOURCE_SCHEMAS):
+        bundles = []
+        for path in discover_shards(source):
+            bundle = load_shard_sketches(path)
+            if bundle is None:
+                missing.append(os.path.basename(path))
+            else:
+                bundles.append(bundle)
+        if bundles:
+            merged[source] = merge_sketches(bundles)
+    return merged, missing
+
+
+# ===================================================================
+# 6. INGEST ALL SOURCES
+# ===================================================================
+if PIPELINE_MODE == 'streaming':
+    ingested_sources, shard_stats, append_shards = None, None, None
+    _shard_count = sum(len(discover_shards(_source)) for _source in SOURCE_SCHEMAS)
+    print(f"\n🌊 Streaming mode: full ingest skipped; {_shard_count} shards will be read in "
+          f"{STREAM_CHUNK_ROWS:,}-row chunks by the Streaming Analysis block")
+else:
+    # In append mode only shards missing from the manifest are parsed; a changed
+    # existing (or removed) shard cannot be appended, so it forces a full ingest instead
+    append_shards = None
+    if PIPELINE_MODE == 'append':
+        _new_shards, _changed_shards = detect_new_shards()
+        if load_shard_manifest().empty or _changed_shards or region_maps_edited():
+            print(f"\n⚠️  Append mode: {len(_changed_shards)} existing shards changed or removed (or no manifest yet, "
+                  f"or the region name tables were edited), running a full ingest")
+        else:
+            append_shards = _new_shards
+            print(f"\n➕ Append mode: {len(append_shards)} new shards: "
+                  f"{[os.path.basename(_path) for _, _path in append_shards]}")
+
+    ingested_sources, shard_stats = ingest_sources(shards=append_shards)
+
+    print(f"\n📦 Per-shard ingestion stats:")
+    print(shard_stats.to_string(index=False))
+
+    _total_rows = shard_stats['rows'].sum()
+    _wall = shard_stats.attrs['wall_seconds']
+    print(f"\n✅ Ingested {len(shard_stats)} shards ({_total_rows:,} rows) with {shard_stats.attrs['workers']} workers")
+    print(f"   Wall time: {_wall:.2f}s ({_total_rows / max(_wall, 1e-9):,.0f} rows/s)")
+
+    if SHARD_CACHE_AVAILABLE:
+        _hits = (shard_stats['cache'] == 'hit').sum()
+        _misses = (shard_stats['cache'] == 'miss').sum()
+        print(f"   Shard cache ({SHARD_CACHE_DIR}): {_hits} hits, {_misses} misses")
+    else:
+        print("   Shard cache disabled: install pyarrow to enable it")
+
+    # Raw spellings collapsed by name normalization, and states still missing a canonical name
+    region_maps = load_region_maps()
+    _canonical_states = {_state for _state in region_maps['states'].values() if _state}
+    _canonical_districts = {(_state, _district) for (_state, _), _district in region_maps['districts'].items()}
+    print(f"\n🏷️  Region names ({REGION_MAP_DIR}/): {len(region_maps['states'])} raw state spellings -> "
+          f"{len(_canonical_states)} canonical states, {len(region_maps['districts'])} raw district spellings -> "
+          f"{len(_canonical_districts)} districts")
+    for _raw in unmapped_states(region_maps):
+        print(f"⚠️  Unmapped state '{_raw}': add its canonical name to {STATE_MAP_PATH}")
+
+    # Manifest of every discovered shard, with the filename row-range check
+    shard_manifest = refresh_shard_manifest()
+    print(f"\n🗂️  Shard manifest ({SHARD_MANIFEST_PATH}):")
+    print(shard_manifest[['source', 'shard', 'rows', 'expected_rows', 'rows_match', 'min_date', 'max_date']].to_string(index=False))
+    for _row in shard_manifest[~shard_manifest['rows_match']].itertuples():
+        print(f"⚠️  {_row.shard}: {_row.rows:,} rows but the filename range implies {_row.expected_rows:,}")
+
+    # Quality and top-N answers from the merged per-shard sketches alone (no rows touched)
+    _start = time.perf_counter()
+    shard_sketches, _missing_sketches = merged_shard_sketches()
+    _distinct, _outliers = sketch_quality_report(shard_sketches)
+    _sketch_ms = (time.perf_counter() - _start) * 1000
+    print(f"\n🧮 Shard sketches ({SHARD_CACHE_DIR}/*.sketches.json), merged and queried in {_sketch_ms:.0f} ms:")
+    print("   Distinct values (HyperLogLog, ± relative error):")
+    print(_distinct.to_string())
+    print("   p99.9 and values above it, per source column (t-digest, ± rank error / count error):")
+    print(_outliers.to_string())
+    if 'enrollment' in shard_sketches:
+        _top = shard_sketches['enrollment']['top_states'].top(5)
+        print("   Top 5 states by enrollment (SpaceSaving, true total in [estimate - error, estimate]):")
+        print(_top.to_string(index=False))
+    for _shard in _missing_sketches:
+        print(f"⚠️  {_shard}: no valid sketches, left out of the merged summaries")
+
+    if 'enrollment' in ingested_sources:
+        _largest_state = ingested_sources['enrollment']['state'].value_counts().index[0]
+        _selected = select_shards('enrollment', states=[_largest_state], manifest=shard_manifest)
+        print(f"\nPartial load for state '{_largest_state}' would read {len(_selected)} of "
+              f"{(shard_manifest['source'] == 'enrollment').sum()} enrollment shards")
@@ -1,3 +1,6 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -15,89 +18,364 @@ plt.rcParams['grid.alpha'] = 0.3
 plt.rcParams['legend.facecolor'] = '#1D1D20'
 plt.rcParams['legend.edgecolor'] = '#909094'
 
-print("=" * 80)
-print("📊 COMPREHENSIVE DATA QUALITY ANALYSIS")
-print("=" * 80)
-
-# 1. DATASET OVERVIEW
-print("\n1️⃣ DATASET OVERVIEW")
-print("-" * 80)
-print(f"Total records: {len(integrated_dataset):,}")
-print(f"Date range: {integrated_dataset['date'].min()} to {integrated_dataset['date'].max()}")
-print(f"Unique states: {integrated_dataset['state'].nunique()}")
-print(f"Unique districts: {integrated_dataset['district'].nunique()}")
-print(f"Unique pincodes: {integrated_dataset['pincode'].nunique()}")
-
-# 2. MISSING VALUE ANALYSIS
-print("\n2️⃣ MISSING VALUE ANALYSIS")
-print("-" * 80)
-missing_analysis = pd.DataFrame({
-    'Column': integrated_dataset.columns,
-    'Missing Count': integrated_dataset.isnull().sum().values,
-    'Missing %': (integrated_dataset.isnull().sum().values / len(integrated_dataset) * 100).round(2)
-})
-missing_analysis = missing_analysis[missing_analysis['Missing Count'] > 0].sort_values('Missing %', ascending=False)
-print(missing_analysis.to_string(index=False))
-
-total_missing_pct = (integrated_dataset.isnull().sum().sum() / (len(integrated_dataset) * len(integrated_dataset.columns)) * 100)
-print(f"\nOverall missing data rate: {total_missing_pct:.2f}%")
-
-# 3. DATA COMPLETENESS BY SOURCE
-print("\n3️⃣ DATA COMPLETENESS BY SOURCE")
-print("-" * 80)
-enroll_complete = integrated_dataset[['age_0_5', 'age_5_17', 'age_18_greater']].notna().all(axis=1).sum()
-demo_complete = integrated_dataset[['demo_age_5_17', 'demo_age_17_']].notna().all(axis=1).sum()
-bio_complete = integrated_dataset[['bio_age_5_17', 'bio_age_17_']].notna().all(axis=1).sum()
-
-print(f"Enrollment data complete: {enroll_complete:,} ({enroll_complete/len(integrated_dataset)*100:.2f}%)")
-print(f"Demographic data complete: {demo_complete:,} ({demo_complete/len(integrated_dataset)*100:.2f}%)")
-print(f"Biometric data complete: {bio_complete:,} ({bio_complete/len(integrated_dataset)*100:.2f}%)")
-
-# 4. STATISTICAL SUMMARIES
-print("\n4️⃣ STATISTICAL SUMMARIES - ENROLLMENT DATA")
-print("-" * 80)
-numeric_cols = ['age_0_5', 'age_5_17', 'age_18_greater', 'demo_age_5_17', 'demo_age_17_', 'bio_age_5_17', 'bio_age_17_']
-stats = integrated_dataset[numeric_cols].describe()
-print(stats.to_string())
-
-# 5. DETECT ANOMALIES
-print("\n5️⃣ ANOMALY DETECTION")
-print("-" * 80)
-
-# Check for negative values
-for col in numeric_cols:
-    negative_count = (integrated_dataset[col] < 0).sum()
-    if negative_count > 0:
-        print(f"⚠️  {col}: {negative_count:,} negative values detected")
-
-# Check for extreme outliers (> 99.9th percentile)
-print("\nExtreme outliers (values > 99.9th percentile):")
-for col in numeric_cols:
-    p999 = integrated_dataset[col].quantile(0.999)
-    outlier_count = (integrated_dataset[col] > p999).sum()
-    if outlier_count > 0:
-        print(f"   {col}: {outlier_count:,} values > {p999:.0f}")
-
-# 6. CONSISTENCY CHECKS
-print("\n6️⃣ DATA CONSISTENCY CHECKS")
-print("-" * 80)
-
-# Check for duplicate geographic/temporal combinations
-duplicates = integrated_dataset.duplicated(subset=['date', 'state', 'district', 'pincode'], keep=False)
-print(f"Duplicate date-state-district-pincode combinations: {duplicates.sum():,}")
-
-# Check for zero enrollments
-zero_enroll = ((integrated_dataset['age_0_5'] == 0) & 
-               (integrated_dataset['age_5_17'] == 0) & 
-               (integrated_dataset['age_18_greater'] == 0))
-print(f"Records with zero enrollment across all age groups: {zero_enroll.sum():,}")
-
-# State name consistency
-print(f"\nState name variations detected: {integrated_dataset['state'].nunique()} unique values")
-state_sample = integrated_dataset['state'].value_counts().head(10)
-print("\nTop 10 states by record count:")
-print(state_sample.to_string())
-
-print("\n" + "=" * 80)
-print("✅ DATA QUALITY ANALYSIS COMPLETE")
-print("=" * 80)
\ No newline at end of file
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
+else:
+    PROFILE_CHUNK_ROWS = 1 << 20
+    PROFILE_QUANTILES = [0.25, 0.5, 0.75, 0.999]
+    PROFILE_DENSE_SPAN = 1 << 20  # widest value range counted with a dense bincount histogram
+    PROFILE_WORKERS = None  # defaults to the CPU count
+
+    # Row-level checks evaluated chunk by chunk in the same pass: name -> (columns, chunk -> bool mask)
+    PROFILE_ROW_CHECKS = {
+        'zero_enrollment': (['age_0_5', 'age_5_17', 'age_18_greater'],
+                            lambda chunk: chunk.eq(0).fillna(False).all(axis=1))
+    }
+
+
+    class ColumnProfile:
+        """Exact value counts of one column, from which every per-column statistic is derived.
+
+        Counts (count, missing, zeros, negatives, distinct), moments, min/max and
+        quantiles all come from the sorted distinct values and their counts, so a
+        new statistic needs no new scan. Categorical columns count their codes.
+        """
+
+        def __init__(self, name, dtype, values, counts, missing, categories=None):
+            self.name, self.dtype, self.values, self.counts = name, dtype, values, counts
+            self.missing, self.categories = missing, categories
+            self.count = int(counts.sum())
+
+        def mean(self):
+            return float(self.values @ self.counts / self.count) if self.count else np.nan
+
+        def std(self):
+            if self.count < 2:
+                return np.nan
+            return float(np.sqrt(((self.values - self.mean()) ** 2) @ self.counts / (self.count - 1)))
+
+        def quantile(self, q):
+            """Return the q-quantile with linear interpolation, as pandas computes it."""
+            if not self.count:
+                return np.nan
+            cumulative = np.cumsum(self.counts)
+            position = (self.count - 1) * q
+            low, high = self.values[np.searchsorted(cumulative, [np.floor(position), np.ceil(position)], side='right')]
+            return float(low + (high - low) * (position - np.floor(position)))
+
+        def count_above(self, threshold):
+            return int(self.counts[self.values > threshold].sum())
+
+        def value_counts(self):
+            """Return the count of every value (every category for a categorical), largest first."""
+            if self.categories is None:
+                counts = pd.Series(self.counts, index=pd.Index(self.values, name=self.name), name='count')
+            else:
+                counts = np.zeros(len(self.categories), dtype=np.int64)
+                counts[self.values] = self.counts
+                counts = pd.Series(counts, index=pd.CategoricalIndex(self.categories, name=self.name), name='count')
+            return counts.sort_values(ascending=False)
+
+        def summary(self, rows):
+            """Return this column's row of the profile table."""
+            numeric = self.categories is None
+            summary = {
+                'dtype': str(self.dtype), 'count': self.count, 'missing': self.missing,
+                'missing_pct': round(self.missing / rows * 100, 2) if rows else 0.0,
+                'distinct': len(self.values),
+                'min': self.values[0] if numeric and self.count else np.nan,
+                'max': self.values[-1] if numeric and self.count else np.nan,
+                'mean': self.mean() if numeric else np.nan,
+                'std': self.std() if numeric else np.nan,
+                'zeros': int(self.counts[self.values == 0].sum()) if numeric else 0,
+                'negatives': int(self.counts[self.values < 0].sum()) if numeric else 0
+            }
+            for q in PROFILE_QUANTILES:
+                summary[f'p{q * 100:g}'] = self.quantile(q) if numeric else np.nan
+            if numeric:
+                summary[f'above_p{PROFILE_QUANTILES[-1] * 100:g}'] = self.count_above(self.quantile(PROFILE_QUANTILES[-1]))
+            return summary
+
+
+    def merge_value_counts(values, counts, chunk_values, chunk_counts):
+        """Merge two sorted (values, counts) tables into one."""
+        merged, inverse = np.unique(np.concatenate([values, chunk_values]), return_inverse=True)
+        return merged, np.bincount(inverse, weights=np.concatenate([counts, chunk_counts]),
+                                   minlength=len(merged)).astype(np.int64)
+
+
+    def profile_column(name, column, chunk_rows=PROFILE_CHUNK_ROWS):
+        """Count the values of one column in a single chunked pass and return its ColumnProfile.
+
+        Narrow value ranges are counted with bincount into a dense histogram that
+        grows as chunks widen it; wider ranges fall back to merged np.unique tables.
+        """
+        categories = column.cat.categories if isinstance(column.dtype, pd.CategoricalDtype) else None
+        array = column.cat.codes.to_numpy() if categories is not None else column.array
+        histogram, low, values, counts, missing = None, 0, None, None, 0
+        for start in range(0, len(array), chunk_rows):
+            chunk = array[start:start + chunk_rows]
+            if categories is not None:
+                present = chunk[chunk >= 0]
+            elif isinstance(chunk, pd.api.extensions.ExtensionArray):
+                present = chunk[~chunk.isna()].to_numpy(dtype=chunk.dtype.numpy_dtype)
+            else:
+                present = chunk[~np.isnan(chunk)] if chunk.dtype.kind == 'f' else np.asarray(chunk)
+            missing += len(chunk) - len(present)
+            if not len(present):
+                continue
+
+            if values is None and present.dtype.kind in 'iub':
+                chunk_low, chunk_high = int(present.min()), int(present.max())
+                new_low = chunk_low if histogram is None else min(low, chunk_low)
+                new_high = chunk_high if histogram is None else max(low + len(histogram) - 1, chunk_high)
+                if new_high - new_low < PROFILE_DENSE_SPAN:
+                    if histogram is None or new_low < low or new_high >= low + len(histogram):
+                        grown = np.zeros(new_high - new_low + 1, dtype=np.int64)
+                        if histogram is not None:
+                            grown[low - new_low:low - new_low + len(histogram)] = histogram
+                        histogram, low = grown, new_low
+                    histogram[chunk_low - low:chunk_high - low + 1] += np.bincount(present - chunk_low)
+                    continue
+            if histogram is not None:
+                nonzero = np.flatnonzero(histogram)
+                values, counts, histogram = nonzero + low, histogram[nonzero], None
+            chunk_values, chunk_counts = np.unique(present, return_counts=True)
+            values, counts = ((chunk_values, chunk_counts) if values is None
+                              else merge_value_counts(values, counts, chunk_values, chunk_counts))
+
+        if histogram is not None:
+            nonzero = np.flatnonzero(histogram)
+            values, counts = nonzero + low, histogram[nonzero]
+        elif values is None:
+            values, counts = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return ColumnProfile(name, column.dtype, values, counts, missing, categories)
+
+
+    def run_row_check(dataset, columns, check, chunk_rows=PROFILE_CHUNK_ROWS):
+        """Return how many rows of dataset pass a row-level check, evaluated chunk by chunk."""
+        frame = dataset[columns]
+        return sum(int(check(frame.iloc[start:start + chunk_rows]).sum()) for start in range(0, len(frame), chunk_rows))
+
+
+    class DuplicateKeyAnalysis:
+        """Rows whose (date, state, district, pincode) key repeats, counted once per distinct key.
+
+        rows is the number of rows in a repeated key (pandas duplicated(keep=False));
+        by_state, by_district and by_date break it down, and worst_keys lists the
+        most repeated keys. Every breakdown is a bincount over the distinct keys.
+        """
+
+        def __init__(self, keys, multiplicity):
+            self.keys, self.multiplicity = keys, multiplicity
+            repeated = multiplicity > 1
+            self.rows = int(multiplicity[repeated].sum())
+            self.repeated_keys = int(repeated.sum())
+            duplicate_rows = np.where(repeated, multiplicity, 0)
+
+            state_codes, states = keys['state']
+            observed = np.bincount(state_codes[state_codes >= 0], minlength=len(states)) > 0
+            by_state = np.bincount(state_codes[state_codes >= 0], weights=duplicate_rows[state_codes >= 0],
+                                   minlength=len(states)).astype(np.int64)
+            self.by_state = pd.Series(by_state[observed], index=pd.Index(states[observed], name='state'))
+
+            self.by_district = self._repeated_frame(['state', 'district']).groupby(
+                ['state', 'district'], observed=True)['rows'].sum().sort_values(ascending=False)
+            self.by_date = self._repeated_frame(['date']).groupby('date')['rows'].sum().sort_index()
+
+        def _repeated_frame(self, columns):
+            """Return the repeated keys as a frame of the given key columns plus their row count."""
+            repeated = self.multiplicity > 1
+            data = {}
+            for col in columns:
+                unpacked = self.keys[col]
+                if col == 'date':
+                    days, missing = unpacked
+                    data[col] = decode_day_numbers(pd.arrays.IntegerArray(days[repeated], missing[repeated]))
+                elif isinstance(unpacked, tuple) and isinstance(unpacked[1], np.ndarray):
+                    data[col] = pd.arrays.IntegerArray(unpacked[0][repeated], unpacked[1][repeated])
+                elif isinstance(unpacked, tuple):
+                    data[col] = pd.Categorical.from_codes(unpacked[0][repeated], categories=unpacked[1], validate=False)
+                else:
+                    data[col] = unpacked[repeated]
+            data['rows'] = self.multiplicity[repeated]
+            return pd.DataFrame(data)
+
+        def worst_keys(self, n=10):
+            """Return the n most repeated keys (ties in key order) with how many rows share each."""
+            return self._repeated_frame(MERGE_KEYS).sort_values(
+                ['rows'] + MERGE_KEYS, ascending=[False] + [True] * len(MERGE_KEYS)).head(n).reset_index(drop=True)
+
+
+    class SourceDuplicateAnalysis:
+        """Duplicate keys within each source as loaded, before the merge collapsed them.
+
+        sources maps each source to its DuplicateKeyAnalysis; rows, repeated_keys
+        and the breakdowns add them up, and worst_keys says which source a key
+        repeats in. (The merged dataset has unique keys unless the merge kept the
+        duplicates, so analysing it would find none.)
+        """
+
+        def __init__(self, sources):
+            self.sources = sources
+            self.rows = sum(analysis.rows for analysis in sources.values())
+            self.repeated_keys = sum(analysis.repeated_keys for analysis in sources.values())
+            self.by_source = pd.Series({name: analysis.rows for name, analysis in sources.items()}, name='rows')
+            # Sources have their own categories, so breakdowns are added up by label
+            self.by_state = self._combine('by_state').sort_index()
+            self.by_district = self._combine('by_district').sort_values(ascending=False, kind='stable')
+            self.by_date = self._combine('by_date').sort_index()
+
+        def _combine(self, breakdown):
+            combined = pd.concat([getattr(analysis, breakdown) for analysis in self.sources.values()])
+            return combined.groupby(level=list(range(combined.index.nlevels)), observed=True).sum().astype(np.int64)
+
+        def worst_keys(self, n=10):
+            """Return the n most repeated keys over all sources, with the source each repeats in."""
+            worst = pd.concat([analysis.worst_keys(n).astype({'state': str, 'district': str}).assign(source=name)
+                               for name, analysis in self.sources.items()], ignore_index=True)
+            return worst.sort_values(['rows'] + MERGE_KEYS, ascending=[False] + [True] * len(MERGE_KEYS),
+                                     kind='stable').head(n)[['source'] + MERGE_KEYS + ['rows']].reset_index(drop=True)
+
+
+    def analyze_source_duplicates(key_counts):
+        """Return the SourceDuplicateAnalysis of each source's (distinct keys, rows per key) from the merge."""
+        return SourceDuplicateAnalysis({name: DuplicateKeyAnalysis(keys, multiplicity)
+                                        for name, (keys, multiplicity) in key_counts.items()})
+
+
+    class DatasetProfile:
+        """Everything Statistical Summaries and the Data Quality Dashboard report about a dataset.
+
+        columns maps each profiled column to its ColumnProfile, table has one row
+        of statistics per column, row_checks the number of rows passing each of
+        PROFILE_ROW_CHECKS, duplicates the SourceDuplicateAnalysis of the merge key and
+        duplicate_key_rows the source rows whose merge key repeats.
+        """
+
+        def __init__(self, rows, columns, row_checks, duplicates, seconds):
+            self.rows, self.columns, self.row_checks = rows, columns, row_checks
+            self.duplicates, self.duplicate_key_rows, self.seconds = duplicates, duplicates.rows, seconds
+            self.table = pd.DataFrame({name: column.summary(rows) for name, column in columns.items()}).T
+
+        def describe(self, columns):
+            """Return the pandas describe() table of numeric columns, computed from the profile."""
+            rows = {'count': 'count', 'mean': 'mean', 'std': 'std', 'min': 'min', '25%': 'p25', '50%': 'p50',
+                    '75%': 'p75', 'max': 'max'}
+            return pd.DataFrame({col: [self.table.at[col, stat] for stat in rows.values()] for col in columns},
+                                index=list(rows), dtype='Float64')
+
+
+    def profile_dataset(dataset, columns, key_counts, workers=PROFILE_WORKERS):
+        """Profile columns of dataset in one pass: each column, row check and the key duplicate count is one task.
+
+        key_counts are the per-source key multiplicities the merge counted before
+        collapsing duplicates (source_key_counts).
+
+        Columns are read once, chunk by chunk, and the tasks run on a thread pool,
+        so the profile costs about one scan however many statistics it reports.
+        """
+        start = time.perf_counter()
+        workers = workers or max(1, min(len(columns), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            column_tasks = {col: pool.submit(profile_column, col, dataset[col]) for col in columns}
+            check_tasks = {name: pool.submit(run_row_check, dataset, check_columns, check)
+                           for name, (check_columns, check) in PROFILE_ROW_CHECKS.items()}
+            duplicate_task = pool.submit(analyze_source_duplicates, key_counts)
+            return DatasetProfile(len(dataset), {col: task.result() for col, task in column_tasks.items()},
+                                  {name: task.result() for name, task in check_tasks.items()},
+                                  duplicate_task.result(), time.perf_counter() - start)
+
+
+    print("=" * 80)
+    print("📊 COMPREHENSIVE DATA QUALITY ANALYSIS")
+    print("=" * 80)
+
+    # Every statistic below comes from this one profiling pass
+    numeric_cols = ['age_0_5', 'age_5_17', 'age_18_greater', 'demo_age_5_17', 'demo_age_17_', 'bio_age_5_17', 'bio_age_17_']
+    data_profile = profile_dataset(integrated_dataset, MERGE_KEYS + numeric_cols, source_key_counts)
+
+    # 1. DATASET OVERVIEW
+    print("\n1️⃣ DATASET OVERVIEW")
+    print("-" * 80)
+    print(f"Total records: {len(integrated_dataset):,}")
+    print(f"Date range: {decode_day_numbers(data_profile.table.at['date', 'min']).strftime('%d-%m-%Y')} to {decode_day_numbers(data_profile.table.at['date', 'max']).strftime('%d-%m-%Y')}")
+    print(f"Unique states: {data_profile.table.at['state', 'distinct']}")
+    print(f"Unique districts: {data_profile.table.at['district', 'distinct']}")
+    print(f"Unique pincodes: {data_profile.table.at['pincode', 'distinct']}")
+
+    # 2. MISSING VALUE ANALYSIS
+    print("\n2️⃣ MISSING VALUE ANALYSIS")
+    print("-" * 80)
+    _missing_counts = data_profile.table['missing'].astype('int64')
+    missing_analysis = pd.DataFrame({
+        'Column': _missing_counts.index,
+        'Missing Count': _missing_counts.values,
+        'Missing %': (_missing_counts.values / len(integrated_dataset) * 100).round(2)
+    })
+    missing_analysis = missing_analysis[missing_analysis['Missing Count'] > 0].sort_values('Missing %', ascending=False)
+    print(missing_analysis.to_string(index=False))
+
+    total_missing_pct = (_missing_counts.sum() / (len(integrated_dataset) * len(_missing_counts)) * 100)
+    print(f"\nOverall missing data rate: {total_missing_pct:.2f}%")
+
+    # 3. DATA COMPLETENESS BY SOURCE
+    print("\n3️⃣ DATA COMPLETENESS BY SOURCE")
+    print("-" * 80)
+    enroll_complete = count_rows_with_sources('enrollment')
+    demo_complete = count_rows_with_sources('demographic')
+    bio_complete = count_rows_with_sources('biometric')
+
+    print(f"Enrollment data complete: {enroll_complete:,} ({enroll_complete/len(integrated_dataset)*100:.2f}%)")
+    print(f"Demographic data complete: {demo_complete:,} ({demo_complete/len(integrated_dataset)*100:.2f}%)")
+    print(f"Biometric data complete: {bio_complete:,} ({bio_complete/len(integrated_dataset)*100:.2f}%)")
+
+    # 4. STATISTICAL SUMMARIES
+    print("\n4️⃣ STATISTICAL SUMMARIES - ENROLLMENT DATA")
+    print("-" * 80)
+    stats = data_profile.describe(numeric_cols)
+    print(stats.to_string())
+
+    # 5. DETECT ANOMALIES
+    print("\n5️⃣ ANOMALY DETECTION")
+    print("-" * 80)
+
+    # Check for negative values
+    for col in numeric_cols:
+        negative_count = data_profile.table.at[col, 'negatives']
+        if negative_count > 0:
+            print(f"⚠️  {col}: {negative_count:,} negative values detected")
+
+    # Check for extreme outliers (> 99.9th percentile)
+    print("\nExtreme outliers (values > 99.9th percentile):")
+    for col in numeric_cols:
+        p999 = data_profile.table.at[col, 'p99.9']
+        outlier_count = data_profile.table.at[col, 'above_p99.9']
+        if outlier_count > 0:
+            print(f"   {col}: {outlier_count:,} values > {p999:.0f}")
+
+    # 6. CONSISTENCY CHECKS
+    print("\n6️⃣ DATA CONSISTENCY CHECKS")
+    print("-" * 80)
+
+    # Check for duplicate geographic/temporal combinations
+    # (within each source before the merge: the merged keys are unique once duplicates are collapsed)
+    print(f"Duplicate date-state-district-pincode combinations: {data_profile.duplicate_key_rows:,} source rows "
+          f"({', '.join(f'{_name} {_rows:,}' for _name, _rows in data_profile.duplicates.by_source.items())})")
+
+    # Check for zero enrollments
+    print(f"Records with zero enrollment across all age groups: {data_profile.row_checks['zero_enrollment']:,}")
+
+    # State name consistency
+    print(f"\nState names after normalization: {data_profile.table.at['state', 'distinct']} unique values "
+          f"(from {len(load_region_maps()['states'])} raw spellings)")
+    state_sample = data_profile.columns['state'].value_counts().head(10)
+    print("\nTop 10 states by record count:")
+    print(state_sample.to_string())
+
+    print(f"\n⏱️  Profiled {len(data_profile.columns)} columns and {len(data_profile.row_checks) + 1} row checks "
+          f"in one pass: {data_profile.seconds:.2f}s")
+
+    print("\n" + "=" * 80)
+    print("✅ DATA QUALITY ANALYSIS COMPLETE")
+    print("=" * 80)
\ No newline at end of file
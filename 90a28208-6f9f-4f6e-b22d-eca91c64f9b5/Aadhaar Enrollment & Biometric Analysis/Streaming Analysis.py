@@ -0,0 +1,106 @@
+import time
+import resource
+import pandas as pd
+
+print("=" * 80)
+print("🌊 STREAMING ANALYSIS (OUT-OF-CORE)")
+print("=" * 80)
+
+# Totals are accumulated chunk by chunk over the raw source rows, so no full
+# concatenated or merged frame is ever built. Because there is no outer merge,
+# rows are not multiplied by duplicate join keys as they are in integrated_dataset.
+
+
+def add_partial(total, part):
+    """Add one chunk's grouped totals into the running totals."""
+    return part if total is None else total.add(part, fill_value=0)
+
+
+def stream_source_summary(source, chunksize=STREAM_CHUNK_ROWS):
+    """Accumulate state/district/date totals, missing and completeness counts for one source."""
+    count_cols = SOURCE_SCHEMAS[source]['count_columns']
+    missing = pd.Series(0, index=list(source_dtypes(source)), dtype='int64')
+    by_state = by_district = by_date = None
+    rows = complete_rows = chunks = max_chunk_rows = 0
+
+    for chunk in prefetch(iter_shard_chunks(source, chunksize)):
+        chunks += 1
+        rows += len(chunk)
+        max_chunk_rows = max(max_chunk_rows, len(chunk))
+        missing += chunk.isna().sum()
+
+        complete = chunk[count_cols].notna().all(axis=1)
+        complete_rows += int(complete.sum())
+        counts = chunk.loc[complete, count_cols].assign(records=1)
+        # Chunk categories differ, so group on the plain labels
+        state = chunk.loc[complete, 'state'].astype(str)
+        district = chunk.loc[complete, 'district'].astype(str)
+
+        by_state = add_partial(by_state, counts.groupby(state).sum())
+        by_district = add_partial(by_district, counts.groupby([state, district]).sum())
+        by_date = add_partial(by_date, counts.groupby(chunk.loc[complete, 'date']).sum())
+
+    return {
+        'rows': rows,
+        'complete_rows': complete_rows,
+        'missing': missing,
+        'by_state': by_state.astype('int64'),
+        'by_district': by_district.astype('int64'),
+        'by_date': by_date.astype('int64').sort_index(),
+        'chunks': chunks,
+        'max_chunk_rows': max_chunk_rows
+    }
+
+
+if PIPELINE_MODE != 'streaming':
+    streaming_summaries = None
+    print("\nSkipped: set AADHAAR_PIPELINE_MODE=streaming to summarize shards out of core")
+else:
+    _start = time.perf_counter()
+    streaming_summaries = {_source: stream_source_summary(_source) for _source in SOURCE_SCHEMAS}
+    _elapsed = time.perf_counter() - _start
+
+    # 1. SOURCE OVERVIEW
+    print("\n📊 SOURCE OVERVIEW")
+    print("-" * 80)
+    for _source, _summary in streaming_summaries.items():
+        print(f"{_source:12s}: {_summary['rows']:,} rows in {_summary['chunks']} chunks, "
+              f"{_summary['complete_rows']:,} complete, {_summary['missing'].sum():,} missing values, "
+              f"{len(_summary['by_date'])} dates")
+
+    # 2. REGIONAL ENROLLMENT
+    print("\n📍 ENROLLMENT BY STATE (Top 15)")
+    print("-" * 80)
+    stream_state_enrollment = streaming_summaries['enrollment']['by_state'].copy()
+    stream_state_enrollment['total_enrollment'] = stream_state_enrollment[SOURCE_SCHEMAS['enrollment']['count_columns']].sum(axis=1)
+    stream_state_enrollment['avg_enrollment_per_record'] = stream_state_enrollment['total_enrollment'] / stream_state_enrollment['records']
+    stream_state_enrollment['enrollment_rate'] = (stream_state_enrollment['total_enrollment'] / stream_state_enrollment['total_enrollment'].sum() * 100).round(2)
+    stream_state_enrollment = stream_state_enrollment.sort_values('total_enrollment', ascending=False)
+    print(stream_state_enrollment.head(15)[['total_enrollment', 'records', 'avg_enrollment_per_record', 'enrollment_rate']].to_string())
+
+    _district_totals = streaming_summaries['enrollment']['by_district'][SOURCE_SCHEMAS['enrollment']['count_columns']].sum(axis=1)
+    print("\nTop 15 Districts by Total Enrollment:")
+    print(_district_totals.sort_values(ascending=False).head(15).to_string())
+
+    # 3. AGE GROUP DISTRIBUTION
+    print("\n👥 AGE GROUP DISTRIBUTION")
+    print("-" * 80)
+    for _source, _summary in streaming_summaries.items():
+        _totals = _summary['by_state'][SOURCE_SCHEMAS[_source]['count_columns']].sum()
+        _shares = ', '.join(f"{_col}: {_val:,} ({_val / _totals.sum() * 100:.2f}%)" for _col, _val in _totals.items())
+        print(f"{_source:12s}: {_shares}")
+
+    # 4. BIOMETRIC BY STATE
+    print("\n🔐 BIOMETRIC USAGE BY STATE (Top 15)")
+    print("-" * 80)
+    stream_state_biometric = streaming_summaries['biometric']['by_state'].copy()
+    stream_state_biometric['total_biometric'] = stream_state_biometric['bio_age_5_17'] + stream_state_biometric['bio_age_17_']
+    stream_state_biometric['avg_per_record'] = stream_state_biometric['total_biometric'] / stream_state_biometric['records']
+    stream_state_biometric['pct_5_17'] = (stream_state_biometric['bio_age_5_17'] / stream_state_biometric['total_biometric'] * 100).round(2)
+    stream_state_biometric = stream_state_biometric.sort_values('total_biometric', ascending=False)
+    print(stream_state_biometric.head(15)[['total_biometric', 'records', 'avg_per_record', 'pct_5_17']].to_string())
+
+    _peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    _max_chunk = max(_summary['max_chunk_rows'] for _summary in streaming_summaries.values())
+    print(f"\n✅ Streamed all sources in {_elapsed:.2f}s with chunks of ≤{_max_chunk:,} rows "
+          f"(process peak RSS {_peak_mb:,.0f} MB)")
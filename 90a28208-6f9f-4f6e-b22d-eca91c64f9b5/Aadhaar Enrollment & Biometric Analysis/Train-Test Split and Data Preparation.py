@@ -1,158 +1,474 @@
+import os
+import json
+import time
+import hashlib
+import resource
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+from numpy.lib.format import open_memmap
 from sklearn.preprocessing import LabelEncoder
 
 print("🚀 TRAIN-TEST SPLIT AND DATA PREPARATION")
 print("=" * 60)
 
-# ===================================================================
-# 1. SELECT MODELING FEATURES
-# ===================================================================
-print("\n📋 Selecting features for modeling...")
-print("-" * 60)
-
-# Define feature columns (exclude target and non-feature columns)
-feature_columns = [
-    # Temporal features
-    'day_of_week', 'day_of_month', 'week_of_year', 'is_weekend', 
-    'is_month_start', 'is_month_end',
+if PIPELINE_MODE == 'streaming':
+    print("\nSkipped: streaming mode does not materialize the sources")
+else:
+    # The feature matrix is written column by column into one preallocated float32
+    # C-contiguous buffer, and X is a DataFrame view of it: no wide copy of
+    # modeling_df is made. A matrix larger than the memory budget is allocated as a
+    # memory-mapped file in FEATURE_MATRIX_DIR instead; the budget defaults to half
+    # of physical memory.
+    FEATURE_MATRIX_DTYPE = np.float32
+    FEATURE_MEMORY_BUDGET_MB = float(os.environ.get('AADHAAR_FEATURE_MEMORY_BUDGET_MB', 0)) or (
+        os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 2 / 1e6)
+    FEATURE_MATRIX_DIR = '.feature_matrix'
+    FEATURE_BLOCK_ROWS = 1_000_000  # rows converted at a time, bounding per-column temporaries
+
+    # Splits are row positions into the feature matrix, never copies of its rows.
+    # They are stored in SPLIT_DIR under a fingerprint of the target, the groups
+    # and the parameters, and reloaded memory-mapped while those are unchanged.
+    SPLIT_DIR = os.path.join(FEATURE_MATRIX_DIR, 'splits')
+    TEST_SIZE = 0.2
+    SPLIT_SEED = 42
+    SPLIT_FOLDS = 5
+    SPLIT_GROUP_COLUMNS = ['pincode', 'district']
+
+
+    def read_rss_mb():
+        """Return (current, peak) resident set size in MB; both are the getrusage peak without /proc."""
+        try:
+            with open('/proc/self/status') as fh:
+                fields = dict(line.split(':', 1) for line in fh if ':' in line)
+            return int(fields['VmRSS'].split()[0]) / 1024, int(fields['VmHWM'].split()[0]) / 1024
+        except (OSError, KeyError):
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            return peak, peak
+
+
+    def reset_peak_rss():
+        """Restart the kernel's peak RSS counter at the current RSS (Linux 4.0+); return whether it could."""
+        try:
+            with open('/proc/self/clear_refs', 'w') as fh:
+                fh.write('5')
+            return True
+        except OSError:
+            return False
+
+
+    def measure_stage(stage, fn, *args):
+        """Run fn(*args), record its time and RSS in preparation_memory, and return its result.
+
+        The peak is that of the stage when the counter can be reset, otherwise
+        the peak of the whole process so far (peak_scope says which).
+        """
+        scope = 'stage' if reset_peak_rss() else 'process'
+        before = read_rss_mb()[0]
+        start = time.perf_counter()
+        result = fn(*args)
+        seconds = time.perf_counter() - start
+        after, peak = read_rss_mb()
+        preparation_memory.append({'stage': stage, 'seconds': seconds, 'rss_before_mb': before,
+                                   'rss_after_mb': after, 'peak_rss_mb': peak, 'peak_scope': scope})
+        return result
+
+
+    def label_encode(values):
+        """Return (fitted LabelEncoder, codes) for a column, equal to LabelEncoder on values.astype(str).
+
+        Categorical columns are encoded through their categories, so the rows are
+        never converted to strings.
+        """
+        encoder = LabelEncoder()
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            return encoder, encoder.fit_transform(values.astype(str))
+        codes = values.cat.codes.to_numpy()
+        # Missing values (code -1) index the trailing 'nan' label, as astype(str) spells them
+        labels = np.append(values.cat.categories.astype(str).to_numpy(), 'nan')
+        used = np.unique(codes)
+        encoder.fit(labels[used])
+        lookup = np.zeros(len(labels), dtype=np.int64)
+        lookup[used] = encoder.transform(labels[used])
+        return encoder, lookup[codes]
+
+
+    def allocate_feature_matrix(rows, columns, budget_mb=FEATURE_MEMORY_BUDGET_MB, directory=FEATURE_MATRIX_DIR):
+        """Return an uninitialized C-ordered (rows, columns) matrix: in memory within the budget, else on disk."""
+        nbytes = rows * columns * np.dtype(FEATURE_MATRIX_DTYPE).itemsize
+        if nbytes <= budget_mb * 1e6:
+            return np.empty((rows, columns), dtype=FEATURE_MATRIX_DTYPE, order='C')
+        os.makedirs(directory, exist_ok=True)
+        return open_memmap(os.path.join(directory, 'X.npy'), mode='w+', dtype=FEATURE_MATRIX_DTYPE, shape=(rows, columns))
+
+
+    def fill_feature_matrix(matrix, sources, block_rows=FEATURE_BLOCK_ROWS):
+        """Write each source column (Series or array) into its matrix column, missing values as 0.
+
+        Returns the number of missing values found per column.
+        """
+        missing = {}
+        for position, (name, values) in enumerate(sources.items()):
+            if isinstance(values, pd.Series):
+                # Views of numpy columns; nullable columns convert a block at a time
+                values = values.array if isinstance(values.dtype, pd.api.extensions.ExtensionDtype) else values.to_numpy()
+            missing[name] = 0
+            for start in range(0, len(matrix), block_rows):
+                block = values[start:start + block_rows]
+                if not isinstance(block, np.ndarray):
+                    block = block.to_numpy(dtype=FEATURE_MATRIX_DTYPE, na_value=np.nan)
+                target = matrix[start:start + block_rows, position]
+                target[...] = block
+                nan = np.isnan(target)
+                if nan.any():
+                    missing[name] += int(nan.sum())
+                    target[nan] = 0
+        return pd.Series(missing, dtype='int64')
+
+
+    def stratified_split(y, test_size=TEST_SIZE, seed=SPLIT_SEED):
+        """Return sorted (train, test) row positions with every class split in proportion.
+
+        The rows are ordered by (class, random key) in one lexsort; the first rows
+        of each class in that order go to test. Each class gets its floor share of
+        the ceil(test_size * rows) test rows and the rest go to the largest remainders.
+        """
+        rows = len(y)
+        codes = np.unique(y, return_inverse=True)[1].ravel()
+        counts = np.bincount(codes)
+        exact = counts * int(np.ceil(test_size * rows)) / rows
+        test_counts = np.floor(exact).astype(np.int64)
+        extra = int(np.ceil(test_size * rows)) - test_counts.sum()
+        test_counts[np.argsort(test_counts - exact, kind='stable')[:extra]] += 1
+
+        order = np.lexsort((np.random.default_rng(seed).random(rows), codes))
+        rank = np.arange(rows) - (np.cumsum(counts) - counts)[codes[order]]
+        is_test = np.zeros(rows, dtype=bool)
+        is_test[order] = rank < test_counts[codes[order]]
+        return np.flatnonzero(~is_test), np.flatnonzero(is_test)
+
+
+    def stratified_folds(y, folds=SPLIT_FOLDS, seed=SPLIT_SEED):
+        """Return the fold (0 .. folds-1) of every row, each class dealt round-robin in a random order.
+
+        Every fold then holds each class's rows to within one.
+        """
+        codes = np.unique(y, return_inverse=True)[1].ravel()
+        order = np.lexsort((np.random.default_rng(seed).random(len(y)), codes))
+        fold = np.empty(len(y), dtype=np.int8)
+        fold[order] = np.arange(len(y)) % folds
+        return fold
+
+
+    def grouped_folds(groups, folds=SPLIT_FOLDS, seed=SPLIT_SEED):
+        """Return the fold of every row with all rows of a group in the same fold.
+
+        The groups are shuffled and laid end to end; a group's fold is the
+        1/folds share of the rows its run starts in, so folds hold about equal rows.
+        """
+        codes, uniques = pd.factorize(groups, use_na_sentinel=False)
+        sizes = np.bincount(codes, minlength=len(uniques))
+        order = np.random.default_rng(seed).permutation(len(sizes))
+        starts = np.cumsum(sizes[order]) - sizes[order]
+        group_fold = np.empty(len(sizes), dtype=np.int8)
+        group_fold[order] = starts * folds // max(len(codes), 1)
+        return group_fold[codes]
+
+
+    def grouped_split(groups, test_size=TEST_SIZE, seed=SPLIT_SEED):
+        """Return sorted (train, test) row positions with every group on one side only.
+
+        Groups are shuffled as in grouped_folds and taken for test until they
+        reach test_size of the rows, so test can exceed it by part of one group.
+        """
+        codes, uniques = pd.factorize(groups, use_na_sentinel=False)
+        sizes = np.bincount(codes, minlength=len(uniques))
+        order = np.random.default_rng(seed).permutation(len(sizes))
+        starts = np.cumsum(sizes[order]) - sizes[order]
+        test_groups = np.zeros(len(sizes), dtype=bool)
+        test_groups[order] = starts < np.ceil(test_size * len(codes))
+        is_test = test_groups[codes]
+        return np.flatnonzero(~is_test), np.flatnonzero(is_test)
+
+
+    def fold_split(folds, fold):
+        """Return sorted (train, test) row positions holding out one fold."""
+        return np.flatnonzero(folds != fold), np.flatnonzero(folds == fold)
+
+
+    def load_or_compute_split(kind, params, inputs, compute, split_dir=SPLIT_DIR):
+        """Return ({name: index array}, whether it was loaded) for a split of the given inputs.
+
+        compute() returns the arrays; they are stored as .npy files named by the
+        fingerprint of the split kind, params and inputs, with a .json listing
+        them written last, and later loaded memory-mapped.
+        """
+        fingerprint = hashlib.blake2b(json.dumps([kind, params, [value_fingerprint(pd.Series(value, copy=False))
+                                                                for value in inputs]]).encode(), digest_size=16).hexdigest()
+        stem = os.path.join(split_dir, f"{kind}-{fingerprint}")
+        if os.path.exists(stem + '.json'):
+            with open(stem + '.json') as fh:
+                names = json.load(fh)['arrays']
+            return {name: np.load(f"{stem}-{name}.npy", mmap_mode='r') for name in names}, True
+
+        arrays = compute()
+        os.makedirs(split_dir, exist_ok=True)
+        for name, values in arrays.items():
+            save_column(f"{stem}-{name}.npy", values)
+        with open(stem + '.json.tmp', 'w') as fh:
+            json.dump({'kind': kind, 'params': params, 'rows': len(inputs[0]), 'arrays': list(arrays)}, fh)
+        os.replace(stem + '.json.tmp', stem + '.json')
+        return arrays, False
+
+
+    class FeatureRows:
+        """A DataFrame stand-in for some rows of the feature matrix that holds only their positions.
+
+        Columns are gathered from the matrix when read and not cached; row
+        selection and take stay lazy, and batches() walks the rows a block at a
+        time (sequentially, as positions are sorted). np.asarray() and sklearn
+        estimators get the rows as a (rows, columns) array. Any other DataFrame
+        attribute materializes the rows once and delegates to it.
+        """
+
+        def __init__(self, matrix, rows, columns, index):
+            self._matrix, self.rows, self._index = matrix, np.asarray(rows), index
+            self.columns = pd.Index(columns)
+
+        @property
+        def index(self):
+            return self._index.take(self.rows)
+
+        @property
+        def shape(self):
+            return len(self), len(self.columns)
+
+        def __len__(self):
+            return len(self.rows)
+
+        def column(self, col):
+            """Return a freshly gathered array of one column."""
+            return self._matrix[self.rows, self.columns.get_loc(col)]
+
+        def __getitem__(self, key):
+            if isinstance(key, str):
+                return pd.Series(self.column(key), index=self.index, name=key, copy=False)
+            if isinstance(key, (pd.Series, np.ndarray)) and key.dtype == bool:
+                return self.take(np.flatnonzero(np.asarray(key)))
+            if isinstance(key, (list, tuple, pd.Index)):
+                return pd.DataFrame({col: self.column(col) for col in key}, index=self.index, copy=False)
+            # As on a DataFrame, anything else (e.g. a row number) is not a column
+            raise KeyError(key)
+
+        def __array__(self, dtype=None, copy=None):
+            rows = self._matrix[self.rows]
+            return rows if dtype is None else rows.astype(dtype, copy=False)
+
+        def take(self, positions):
+            """Return a lazy view of the rows at positions (relative to these rows)."""
+            return type(self)(self._matrix, self.rows[np.asarray(positions)], self.columns, self._index)
+
+        def batches(self, batch_rows=FEATURE_BLOCK_ROWS):
+            """Yield (positions, matrix rows) blocks of at most batch_rows rows."""
+            for start in range(0, len(self.rows), batch_rows):
+                positions = self.rows[start:start + batch_rows]
+                yield positions, self._matrix[positions]
+
+        def missing_counts(self):
+            """Return the number of NaN values of every column, reading a block of rows at a time."""
+            counts = np.zeros(len(self.columns), dtype=np.int64)
+            for _, block in self.batches():
+                counts += np.isnan(block).sum(axis=0)
+            return pd.Series(counts, index=self.columns)
+
+        def to_frame(self):
+            return pd.DataFrame(self._matrix[self.rows], index=self.index, columns=self.columns, copy=False)
+
+        def __getattr__(self, name):
+            if name.startswith('_'):
+                raise AttributeError(name)
+            return getattr(self.to_frame(), name)
+
+
+    preparation_memory = []
+
+    # ===================================================================
+    # 1. SELECT MODELING FEATURES
+    # ===================================================================
+    print("\n📋 Selecting features for modeling...")
+    print("-" * 60)
+
+    # Define feature columns (exclude target and non-feature columns)
+    feature_columns = [
+        # Temporal features
+        'day_of_week', 'day_of_month', 'week_of_year', 'is_weekend', 
+        'is_month_start', 'is_month_end',
     
-    # Original enrollment counts
-    'age_0_5', 'age_5_17', 'age_18_greater',
-    'demo_age_5_17', 'demo_age_17_',
-    'bio_age_5_17', 'bio_age_17_',
+        # Original enrollment counts
+        'age_0_5', 'age_5_17', 'age_18_greater',
+        'demo_age_5_17', 'demo_age_17_',
+        'bio_age_5_17', 'bio_age_17_',
     
-    # Aggregated enrollment metrics
-    'total_enrollment', 'total_demographic', 'total_biometric', 
-    'total_all_enrollments',
+        # Aggregated enrollment metrics
+        'total_enrollment', 'total_demographic', 'total_biometric', 
+        'total_all_enrollments',
     
-    # Age group indicators and proportions
-    'has_age_0_5', 'has_age_5_17_enroll', 'has_age_18_plus',
-    'pct_age_0_5', 'pct_age_5_17', 'pct_age_18_plus', 
-    'num_age_groups_covered',
+        # Age group indicators and proportions
+        'has_age_0_5', 'has_age_5_17_enroll', 'has_age_18_plus',
+        'pct_age_0_5', 'pct_age_5_17', 'pct_age_18_plus', 
+        'num_age_groups_covered',
     
-    # Biometric completeness
-    'bio_completeness_score', 'bio_to_demo_ratio', 'bio_to_enroll_ratio',
+        # Biometric completeness
+        'bio_completeness_score', 'bio_to_demo_ratio', 'bio_to_enroll_ratio',
     
-    # Regional features (state-level, district-level, pincode-level)
-    'state_enrollment_rate', 'state_avg_enrollments', 'state_record_count',
-    'district_enrollment_rate', 'pincode_enrollment_rate',
+        # Regional features (state-level, district-level, pincode-level)
+        'state_enrollment_rate', 'state_avg_enrollments', 'state_record_count',
+        'district_enrollment_rate', 'pincode_enrollment_rate',
     
-    # Data quality indicators
-    'data_types_present', 'is_partial_enrollment', 'has_zero_enrollments',
+        # Data quality indicators
+        'data_types_present', 'is_partial_enrollment', 'has_zero_enrollments',
     
-    # Helper indicators
-    'has_enrollment', 'has_demographic', 'has_biometric'
-]
+        # Helper indicators
+        'has_enrollment', 'has_demographic', 'has_biometric'
+    ]
 
-# Categorical features to encode
-categorical_features = ['state', 'district']
+    # Categorical features to encode
+    categorical_features = ['state', 'district']
 
-print(f"✓ Selected {len(feature_columns)} numerical features")
-print(f"✓ Selected {len(categorical_features)} categorical features")
+    print(f"✓ Selected {len(feature_columns)} numerical features")
+    print(f"✓ Selected {len(categorical_features)} categorical features")
 
-# ===================================================================
-# 2. ENCODE CATEGORICAL VARIABLES
-# ===================================================================
-print("\n🔤 Encoding categorical variables...")
-print("-" * 60)
+    # ===================================================================
+    # 2. ENCODE CATEGORICAL VARIABLES
+    # ===================================================================
+    print("\n🔤 Encoding categorical variables...")
+    print("-" * 60)
 
-modeling_data = modeling_df.copy()
+    # Encoded from the category codes; modeling_df itself is not copied
+    (state_encoder, _state_codes), (district_encoder, _district_codes) = measure_stage(
+        'encode', lambda: (label_encode(modeling_df['state']), label_encode(modeling_df['district'])))
 
-# Label encode state and district
-state_encoder = LabelEncoder()
-district_encoder = LabelEncoder()
+    print(f"✓ Encoded 'state' → state_encoded ({len(state_encoder.classes_)} unique values)")
+    print(f"✓ Encoded 'district' → district_encoded ({len(district_encoder.classes_)} unique values)")
 
-modeling_data['state_encoded'] = state_encoder.fit_transform(modeling_data['state'].astype(str))
-modeling_data['district_encoded'] = district_encoder.fit_transform(modeling_data['district'].astype(str))
+    # Add encoded features to feature list
+    feature_columns.extend(['state_encoded', 'district_encoded'])
 
-print(f"✓ Encoded 'state' → state_encoded ({modeling_data['state_encoded'].nunique()} unique values)")
-print(f"✓ Encoded 'district' → district_encoded ({modeling_data['district_encoded'].nunique()} unique values)")
+    # ===================================================================
+    # 3. PREPARE X AND y
+    # ===================================================================
+    print("\n🎯 Preparing X (features) and y (target)...")
+    print("-" * 60)
 
-# Add encoded features to feature list
-feature_columns.extend(['state_encoded', 'district_encoded'])
+    # Target variable
+    y = modeling_df['enrollment_complete'].to_numpy()
 
-# ===================================================================
-# 3. PREPARE X AND y
-# ===================================================================
-print("\n🎯 Preparing X (features) and y (target)...")
-print("-" * 60)
+    # Feature matrix: every column is written straight into the preallocated buffer
+    _matrix_mb = len(modeling_df) * len(feature_columns) * np.dtype(FEATURE_MATRIX_DTYPE).itemsize / 1e6
+    feature_matrix = measure_stage('allocate', allocate_feature_matrix, len(modeling_df), len(feature_columns))
+    print(f"Memory budget {FEATURE_MEMORY_BUDGET_MB:,.0f} MB; {np.dtype(FEATURE_MATRIX_DTYPE).name} matrix "
+          f"{_matrix_mb:,.1f} MB -> {'memory-mapped in ' + FEATURE_MATRIX_DIR + '/' if isinstance(feature_matrix, np.memmap) else 'in memory'}")
 
-# Target variable
-y = modeling_data['enrollment_complete'].values
+    _sources = {_col: modeling_df[_col] for _col in feature_columns[:-2]}
+    _sources.update(state_encoded=_state_codes, district_encoded=_district_codes)
+    missing_counts = measure_stage('fill', fill_feature_matrix, feature_matrix, _sources)
+    X = pd.DataFrame(feature_matrix, index=modeling_df.index, columns=feature_columns, copy=False)
 
-# Feature matrix
-X = modeling_data[feature_columns].copy()
+    # Missing values were replaced by 0 while the columns were written
+    print(f"\nChecking for missing values in features:")
+    if missing_counts.sum() > 0:
+        print(f"  Found {missing_counts.sum()} missing values across features")
+        print(f"  Filled missing values with 0")
+    else:
+        print(f"  ✓ No missing values detected")
 
-# Handle any remaining NaN values (fill with 0 or appropriate value)
-print(f"\nChecking for missing values in features:")
-missing_counts = X.isnull().sum()
-if missing_counts.sum() > 0:
-    print(f"  Found {missing_counts.sum()} missing values across features")
-    print(f"  Filling missing values with 0...")
-    X = X.fillna(0)
-else:
-    print(f"  ✓ No missing values detected")
-
-print(f"\n✓ Feature matrix shape: {X.shape}")
-print(f"✓ Target shape: {y.shape}")
-print(f"✓ Total features: {X.shape[1]}")
-
-# ===================================================================
-# 4. TRAIN-TEST SPLIT
-# ===================================================================
-print("\n✂️  Splitting data into train and test sets...")
-print("-" * 60)
-
-# 80-20 train-test split with stratification
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y,
-    test_size=0.2,
-    random_state=42,
-    stratify=y  # Maintain class distribution
-)
-
-print(f"✓ Train set: {X_train.shape[0]:,} samples ({X_train.shape[0]/len(X)*100:.1f}%)")
-print(f"✓ Test set:  {X_test.shape[0]:,} samples ({X_test.shape[0]/len(X)*100:.1f}%)")
-
-print(f"\nTarget distribution in train set:")
-print(f"  Complete (1): {y_train.sum():,} ({y_train.mean()*100:.2f}%)")
-print(f"  Incomplete (0): {(1-y_train).sum():,} ({(1-y_train.mean())*100:.2f}%)")
-
-print(f"\nTarget distribution in test set:")
-print(f"  Complete (1): {y_test.sum():,} ({y_test.mean()*100:.2f}%)")
-print(f"  Incomplete (0): {(1-y_test).sum():,} ({(1-y_test.mean())*100:.2f}%)")
-
-# ===================================================================
-# 5. FEATURE STATISTICS
-# ===================================================================
-print("\n📊 Feature Statistics Summary...")
-print("-" * 60)
-
-print(f"\nFeature value ranges (first 10 features):")
-for _feat in feature_columns[:10]:
-    _min_val = X[_feat].min()
-    _max_val = X[_feat].max()
-    _mean_val = X[_feat].mean()
-    print(f"  {_feat:30s}: [{_min_val:>10.2f}, {_max_val:>10.2f}], mean={_mean_val:>10.2f}")
-
-# ===================================================================
-# SUMMARY
-# ===================================================================
-print("\n" + "=" * 60)
-print("✅ DATA PREPARATION COMPLETE")
-print("=" * 60)
+    print(f"\n✓ Feature matrix shape: {X.shape}")
+    print(f"✓ Target shape: {y.shape}")
+    print(f"✓ Total features: {X.shape[1]}")
+
+    # ===================================================================
+    # 4. TRAIN-TEST SPLIT
+    # ===================================================================
+    print("\n✂️  Splitting data into train and test sets...")
+    print("-" * 60)
+
+    # 80-20 train-test split with stratification, as row positions into the feature
+    # matrix; X_train and X_test are lazy views of those rows
+    _split_params = {'test_size': TEST_SIZE, 'seed': SPLIT_SEED}
+    split_indices, _split_loaded = measure_stage('split', load_or_compute_split, 'stratified', _split_params, [y],
+                                                 lambda: dict(zip(['train', 'test'], stratified_split(y))))
+    train_idx, test_idx = split_indices['train'], split_indices['test']
+    X_train = FeatureRows(feature_matrix, train_idx, feature_columns, X.index)
+    X_test = FeatureRows(feature_matrix, test_idx, feature_columns, X.index)
+    y_train, y_test = y[train_idx], y[test_idx]
+    print(f"{'Loaded' if _split_loaded else 'Computed and stored'} split indices ({SPLIT_DIR}/, "
+          f"{(train_idx.nbytes + test_idx.nbytes) / 1e6:,.1f} MB instead of a {feature_matrix.nbytes / 1e6:,.1f} MB copy)")
+
+    print(f"✓ Train set: {X_train.shape[0]:,} samples ({X_train.shape[0]/len(X)*100:.1f}%)")
+    print(f"✓ Test set:  {X_test.shape[0]:,} samples ({X_test.shape[0]/len(X)*100:.1f}%)")
+
+    print(f"\nTarget distribution in train set:")
+    print(f"  Complete (1): {y_train.sum():,} ({y_train.mean()*100:.2f}%)")
+    print(f"  Incomplete (0): {(1-y_train).sum():,} ({(1-y_train.mean())*100:.2f}%)")
+
+    print(f"\nTarget distribution in test set:")
+    print(f"  Complete (1): {y_test.sum():,} ({y_test.mean()*100:.2f}%)")
+    print(f"  Incomplete (0): {(1-y_test).sum():,} ({(1-y_test.mean())*100:.2f}%)")
+
+    # Cross-validation folds: stratified by the target, and grouped so that no
+    # pincode or district appears in two folds
+    _fold_params = {'folds': SPLIT_FOLDS, 'seed': SPLIT_SEED}
+    cv_folds = {'stratified': load_or_compute_split('stratified_folds', _fold_params, [y],
+                                                    lambda: {'fold': stratified_folds(y)})[0]['fold']}
+    for _col in SPLIT_GROUP_COLUMNS:
+        cv_folds[_col] = load_or_compute_split(f'{_col}_folds', _fold_params, [modeling_df[_col]],
+                                               lambda: {'fold': grouped_folds(modeling_df[_col])})[0]['fold']
+
+    print(f"\n{SPLIT_FOLDS}-fold cross-validation (test rows and target rate per fold; fold_split(cv_folds[kind], k) "
+          f"gives the positions):")
+    for _kind, _folds in cv_folds.items():
+        _sizes = np.bincount(_folds, minlength=SPLIT_FOLDS)
+        _rates = np.bincount(_folds, weights=y, minlength=SPLIT_FOLDS) / np.maximum(_sizes, 1) * 100
+        print(f"  {_kind:12s}: " + ', '.join(f"{_size:,} ({_rate:.2f}%)" for _size, _rate in zip(_sizes, _rates)))
+
+    # ===================================================================
+    # 5. FEATURE STATISTICS
+    # ===================================================================
+    print("\n📊 Feature Statistics Summary...")
+    print("-" * 60)
+
+    print(f"\nFeature value ranges (first 10 features):")
+    for _feat in feature_columns[:10]:
+        _min_val = X[_feat].min()
+        _max_val = X[_feat].max()
+        _mean_val = X[_feat].mean()
+        print(f"  {_feat:30s}: [{_min_val:>10.2f}, {_max_val:>10.2f}], mean={_mean_val:>10.2f}")
+
+    # ===================================================================
+    # SUMMARY
+    # ===================================================================
+    print("\n" + "=" * 60)
+    print("✅ DATA PREPARATION COMPLETE")
+    print("=" * 60)
+
+    print(f"\n📦 Modeling Dataset Ready:")
+    print(f"   Total samples: {len(X):,}")
+    print(f"   Total features: {X.shape[1]}")
+    print(f"   Train samples: {X_train.shape[0]:,}")
+    print(f"   Test samples: {X_test.shape[0]:,}")
+    print(f"   Target variable: enrollment_complete")
+    print(f"   Class balance: {y.mean()*100:.2f}% complete, {(1-y.mean())*100:.2f}% incomplete")
+
+    # Memory by stage: RSS before and after, and the highest RSS reached while it ran
+    preparation_memory = pd.DataFrame(preparation_memory)
+    print(f"\n🧠 Memory by stage (feature matrix {feature_matrix.nbytes / 1e6:,.1f} MB, "
+          f"C-contiguous: {feature_matrix.flags['C_CONTIGUOUS']}):")
+    print(preparation_memory.round(3).to_string(index=False))
+
+    # The split views are passed to estimators as they are (np.asarray gathers their rows)
+    print(f"\n🧩 X_train: {(len(X_train.rows), len(X_train.columns))} view of feature_matrix, no rows copied")
 
-print(f"\n📦 Modeling Dataset Ready:")
-print(f"   Total samples: {len(X):,}")
-print(f"   Total features: {X.shape[1]}")
-print(f"   Train samples: {X_train.shape[0]:,}")
-print(f"   Test samples: {X_test.shape[0]:,}")
-print(f"   Target variable: enrollment_complete")
-print(f"   Class balance: {y.mean()*100:.2f}% complete, {(1-y.mean())*100:.2f}% incomplete")
-
-print(f"\n🎯 Ready for model training!")
-print(f"   Use X_train, X_test, y_train, y_test for modeling")
-print(f"   All features are numerical and properly encoded")
-print(f"   No missing values present")
+    print(f"\n🎯 Ready for model training!")
+    print(f"   Use X_train, X_test, y_train, y_test for modeling")
+    print(f"   (X_train and X_test are views of feature_matrix rows train_idx and test_idx; see FeatureRows.batches)")
+    print(f"   All features are numerical and properly encoded")
+    print(f"   No missing values present")